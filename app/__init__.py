@@ -0,0 +1,4 @@
+import time
+
+# Reference point for the import phase reported in app_startup_seconds.
+IMPORT_STARTED = time.perf_counter()
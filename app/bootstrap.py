@@ -0,0 +1,77 @@
+"""
+Idempotent database bootstrap: schema migrations and default users.
+
+Run before starting the app (every deploy, as often as you like):
+
+    python -m app.bootstrap
+
+Concurrent runs take turns on a Postgres advisory lock, and a run against an
+up-to-date database only reads. The Argon2 hash is paid once per missing user
+instead of on every worker start.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Iterable, Optional, Tuple
+
+from .database import (
+    SCHEMA_VERSION,
+    advisory_lock,
+    create_user_db,
+    engine,
+    get_schema_version_db,
+    get_user_by_username_db,
+)
+from .migrations import migrate
+
+logger = logging.getLogger(__name__)
+
+
+def default_users() -> list:
+    """(username, password) pairs configured through DEFAULT_USER_*/DEFAULT_PASSWORD_*."""
+    return [
+        (
+            os.getenv("DEFAULT_USER_ALICE", "alice"),
+            os.getenv("DEFAULT_PASSWORD_ALICE", "alicepass"),
+        ),
+        (
+            os.getenv("DEFAULT_USER_BOB", "bob"),
+            os.getenv("DEFAULT_PASSWORD_BOB", "bobpass"),
+        ),
+    ]
+
+
+async def bootstrap(users: Optional[Iterable[Tuple[str, str]]] = None) -> dict:
+    """Create the schema and missing users; returns what was done."""
+    users = default_users() if users is None else users
+    started = time.perf_counter()
+    async with advisory_lock():
+        version = await get_schema_version_db()
+        applied = await migrate() if version < SCHEMA_VERSION else []
+        created = []
+        for username, password in users:
+            if not await get_user_by_username_db(username):
+                if await create_user_db(username, password):
+                    created.append(username)
+    return {
+        "schema_version": await get_schema_version_db(),
+        "previous_version": version,
+        "applied_migrations": applied,
+        "created_users": created,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def _main() -> None:
+    try:
+        result = await bootstrap()
+    finally:
+        await engine.dispose()
+    logger.info("bootstrap finished: %s", result)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(_main())
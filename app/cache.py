@@ -0,0 +1,299 @@
+"""
+Read-through cache for suggestion reads.
+
+Single suggestions are cached by id and dropped when that row changes. List
+pages are cached under the list version stored in the database, so a write by
+any worker makes stale pages unreachable; they age out of the LRU.
+
+A read that loaded a row just before a write committed must not put it back
+after the write invalidated it. Invalidation therefore leaves a short-lived
+tombstone, and reads only store what they loaded under a key that holds
+nothing, tombstones included.
+
+Next to the rows, reads keep their response body compressed per encoding, so
+a hot payload is encoded and compressed once rather than on every hit.
+
+``MemoryCache`` is a bounded per-process LRU with TTL. ``RedisCache`` shares
+entries between workers and needs the optional ``redis`` package.
+"""
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from .compression import ENCODINGS
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+# Longer than a load takes from its SELECT to storing the result.
+CACHE_TOMBSTONE_TTL = float(os.getenv("CACHE_TOMBSTONE_TTL", "2"))
+
+_MISSING = object()
+_TOMBSTONE = object()
+# Leading byte of bytes values in Redis, and the whole value of a tombstone;
+# JSON text never starts with either.
+_BYTES = b"\x00"
+_TOMBSTONE_RAW = b"\x01"
+
+
+class Cache(ABC):
+    """Interface shared by cache backends; counts hits and misses."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Return the cached value or _MISSING."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Store value under key."""
+
+    @abstractmethod
+    async def add(self, key: str, value: Any) -> bool:
+        """Store value unless key holds a value or tombstone; returns whether it did."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Drop the given keys."""
+
+    @abstractmethod
+    async def invalidate(self, *keys: str, ttl: float = CACHE_TOMBSTONE_TTL) -> None:
+        """Replace the given keys with tombstones that refuse add() for ttl seconds."""
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class NullCache(Cache):
+    """Cache that never stores anything (CACHE_BACKEND=none)."""
+
+    async def get(self, key: str) -> Any:
+        self.misses += 1
+        return _MISSING
+
+    async def set(self, key: str, value: Any) -> None:
+        pass
+
+    async def add(self, key: str, value: Any) -> bool:
+        return False
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def invalidate(self, *keys: str, ttl: float = CACHE_TOMBSTONE_TTL) -> None:
+        pass
+
+
+class MemoryCache(Cache):
+    """Bounded LRU with per-entry TTL."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Any:
+        entry = self._live(key)
+        if entry is None or entry[1] is _TOMBSTONE:
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        self._store(key, value, self.ttl)
+
+    async def add(self, key: str, value: Any) -> bool:
+        if self._live(key) is not None:
+            return False
+        self._store(key, value, self.ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def invalidate(self, *keys: str, ttl: float = CACHE_TOMBSTONE_TTL) -> None:
+        for key in keys:
+            self._store(key, _TOMBSTONE, ttl)
+
+    def _live(self, key: str) -> Optional[tuple[float, Any]]:
+        """The unexpired entry under key, dropping an expired one."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def _store(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._entries)}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCache(Cache):
+    """Cache shared by all workers through Redis."""
+
+    def __init__(self, client, ttl: float = CACHE_TTL):
+        super().__init__()
+        self.ttl = ttl
+        self._redis = client
+
+    async def get(self, key: str) -> Any:
+        raw = await self._redis.get(key)
+        if raw is None or raw == _TOMBSTONE_RAW:
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        if raw[:1] == _BYTES:
+            return raw[1:]
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._redis.set(key, self._dump(value), px=int(self.ttl * 1000))
+
+    async def add(self, key: str, value: Any) -> bool:
+        # SET NX is atomic, so a tombstone set by another worker always wins.
+        stored = await self._redis.set(
+            key, self._dump(value), px=int(self.ttl * 1000), nx=True
+        )
+        return bool(stored)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def invalidate(self, *keys: str, ttl: float = CACHE_TOMBSTONE_TTL) -> None:
+        if not keys:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, _TOMBSTONE_RAW, px=int(ttl * 1000))
+            await pipe.execute()
+
+    @staticmethod
+    def _dump(value: Any):
+        return _BYTES + value if isinstance(value, bytes) else json.dumps(value)
+
+
+class SuggestionCache:
+    """Caching policy for suggestion reads on top of a Cache backend."""
+
+    def __init__(self, backend: Cache, bodies: Optional[Cache] = None):
+        self.backend = backend
+        # Encoded response bodies; kept apart so that large bodies neither evict
+        # rows nor blur the row hit rate.
+        self.bodies = backend if bodies is None else bodies
+
+    @staticmethod
+    def suggestion_key(suggestion_id: int) -> str:
+        return f"suggestion:{suggestion_id}"
+
+    @staticmethod
+    def page_key(
+        status: Optional[str], after: Optional[int], limit: Optional[int], version: str
+    ) -> str:
+        return f"suggestions:{status or '*'}:{version}:{after}:{limit}"
+
+    async def get_suggestion(
+        self, suggestion_id: int, load: Callable[[], Awaitable[Optional[dict]]]
+    ) -> Optional[dict]:
+        key = self.suggestion_key(suggestion_id)
+        value = await self.backend.get(key)
+        if value is _MISSING:
+            value = await load()
+            if value is not None:
+                await self.backend.add(key, value)
+        return value
+
+    async def get_page(
+        self,
+        status: Optional[str],
+        after: Optional[int],
+        limit: Optional[int],
+        version: str,
+        load: Callable[[], Awaitable[list]],
+    ) -> list:
+        key = self.page_key(status, after, limit, version)
+        value = await self.backend.get(key)
+        if value is _MISSING:
+            value = await load()
+            await self.backend.set(key, value)
+        return value
+
+    async def get_body(
+        self,
+        key: str,
+        encoding: str,
+        render: Callable[[], Tuple[Optional[str], bytes]],
+    ) -> Tuple[Optional[str], bytes]:
+        """
+        Response body of the entry under key as sent to clients accepting encoding.
+
+        render returns (content encoding or None when not worth compressing, body);
+        both are stored as one "<encoding>\\n<body>" value.
+        """
+        body_key = f"{key}:{encoding}"
+        value = await self.bodies.get(body_key)
+        if value is _MISSING:
+            used, body = render()
+            value = (used or "").encode() + b"\n" + body
+            await self.bodies.add(body_key, value)
+        used, _, body = value.partition(b"\n")
+        return used.decode() or None, body
+
+    async def changed(self, *suggestion_ids: int) -> None:
+        """Invalidate rows once their change committed; see the module docstring."""
+        keys = [self.suggestion_key(i) for i in suggestion_ids]
+        await self.backend.invalidate(*keys)
+        await self.bodies.invalidate(
+            *(f"{key}:{enc}" for key in keys for enc in ENCODINGS)
+        )
+
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+    def clear(self) -> None:
+        for backend in (self.backend, self.bodies):
+            if isinstance(backend, MemoryCache):
+                backend.clear()
+
+
+def create_cache() -> Cache:
+    """Build the backend selected by CACHE_BACKEND."""
+    if CACHE_BACKEND == "memory":
+        return MemoryCache()
+    if CACHE_BACKEND == "redis":
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the redis package"
+            ) from exc
+        return RedisCache(redis.from_url(CACHE_REDIS_URL))
+    if CACHE_BACKEND == "none":
+        return NullCache()
+    raise ValueError(f"unknown CACHE_BACKEND: {CACHE_BACKEND!r}")
+
+
+suggestion_cache = SuggestionCache(create_cache(), bodies=create_cache())
@@ -0,0 +1,182 @@
+"""
+Response compression.
+
+``CompressionMiddleware`` compresses text-like responses of at least
+COMPRESSION_MIN_SIZE bytes with the best encoding the client accepts: Brotli
+when the optional ``brotli`` package is installed, otherwise gzip. Streaming
+responses are compressed chunk by chunk and flushed after every chunk, so
+NDJSON rows still reach the client as they are produced.
+
+Responses that already carry a Content-Encoding pass through untouched; that
+is how cached suggestion reads send bodies compressed once and stored in the
+cache (see ``SuggestionCache.get_body``).
+"""
+
+import gzip
+import os
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# Server preference among encodings the client accepts equally.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best encoding allowed by an Accept-Encoding header, None for identity."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes whole chunks to the client."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(
+                COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses for clients that accept it."""
+
+    def __init__(self, app, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            (_header(scope["headers"], b"accept-encoding") or b"").decode("latin-1")
+        )
+        start = None
+        headers = []
+        buffer = []
+        stream = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, headers, stream, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                headers = message.get("headers", [])
+                content_type = (_header(headers, b"content-type") or b"").decode()
+                if _header(headers, b"content-encoding") or not is_compressible(
+                    content_type
+                ):
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is None and not buffer:
+                # First chunk: decide from the declared length when there is one.
+                vary = _header(headers, b"vary")
+                headers = [(k, v) for k, v in headers if k.lower() != b"vary"]
+                headers.append(
+                    (
+                        b"vary",
+                        vary + b", Accept-Encoding" if vary else b"Accept-Encoding",
+                    )
+                )
+                length = _header(headers, b"content-length")
+                if length is None and not more_body:
+                    length = len(body)
+                if encoding is None or (
+                    length is not None and int(length) < self.min_size
+                ):
+                    passthrough = True
+                    await send({**start, "headers": headers})
+                    await send(message)
+                    return
+                headers = [(k, v) for k, v in headers if k.lower() != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                if length is None:
+                    # Open-ended stream: compress as chunks arrive.
+                    stream = _StreamCompressor(encoding)
+                    await send({**start, "headers": headers})
+
+            if stream is not None:
+                data = stream.chunk(body) if body else b""
+                if not more_body:
+                    data += stream.finish()
+                await send(
+                    {"type": "http.response.body", "body": data, "more_body": more_body}
+                )
+                return
+
+            # Known length: compress the whole body once and keep Content-Length.
+            buffer.append(body)
+            if more_body:
+                return
+            compressed = compress(b"".join(buffer), encoding)
+            headers.append((b"content-length", str(len(compressed)).encode()))
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
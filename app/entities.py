@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -32,3 +32,71 @@ class SuggestionOut(BaseModel):
     title: str
     text: str
     status: str
+
+
+class SuggestionSearchHit(SuggestionOut):
+    rank: float
+    title_highlight: str
+    snippet: str
+
+
+class SuggestionStats(BaseModel):
+    user_id: Optional[int] = None
+    total: int
+    by_status: Dict[str, int]
+
+
+MAX_BATCH_SIZE = 500
+
+
+class SuggestionUpdateItem(SuggestionCreate):
+    id: int
+    # Unlike on create, a missing status leaves the current one unchanged.
+    status: Optional[SuggestionStatus] = None
+
+
+class SuggestionBatch(BaseModel):
+    create: List[SuggestionCreate] = Field(
+        default_factory=list, max_length=MAX_BATCH_SIZE
+    )
+    update: List[SuggestionUpdateItem] = Field(
+        default_factory=list, max_length=MAX_BATCH_SIZE
+    )
+    delete: List[int] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+
+    @field_validator("delete")
+    @classmethod
+    def unique_ids(cls, v: List[int]) -> List[int]:
+        return list(dict.fromkeys(v))
+
+    @field_validator("update")
+    @classmethod
+    def unique_update_ids(
+        cls, v: List[SuggestionUpdateItem]
+    ) -> List[SuggestionUpdateItem]:
+        # Unlike deletes, repeated updates may differ, and only one could apply.
+        ids = [item.id for item in v]
+        duplicates = sorted({i for i in ids if ids.count(i) > 1})
+        if duplicates:
+            raise ValueError(f"duplicate update ids: {duplicates}")
+        return v
+
+
+class SuggestionStatusUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    status: SuggestionStatus
+
+    @field_validator("ids")
+    @classmethod
+    def unique_ids(cls, v: List[int]) -> List[int]:
+        return list(dict.fromkeys(v))
+
+
+class BatchItemResult(BaseModel):
+    op: str
+    id: int
+    result: str
+
+
+class BatchResult(BaseModel):
+    results: List[BatchItemResult]
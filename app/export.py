@@ -0,0 +1,150 @@
+"""
+Bulk export of suggestions as CSV or NDJSON (NFR-10).
+
+Rows are read through a server-side cursor in chunks of EXPORT_CHUNK_SIZE and
+encoded chunk by chunk, optionally through a streaming gzip compressor, so an
+export of any size runs in constant memory. ``user_id`` is masked by default
+with a keyed hash (HMAC-SHA256 under EXPORT_MASK_KEY): the same user gets the
+same pseudonym within and across exports made with one key, so masked exports
+can still be joined, but ids cannot be recovered without the key. The key has
+to be configured: a generated one would change with every restart and differ
+between workers, so masking without it is refused.
+
+    python -m app.export --format csv --gzip -o suggestions.csv.gz
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import hmac
+import io
+import logging
+import os
+import sys
+import zlib
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+import orjson
+
+from .database import engine, iter_suggestion_chunks_db
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+EXPORT_MASK_KEY = os.getenv("EXPORT_MASK_KEY", "")
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+COLUMNS = ("id", "user_id", "title", "text", "status", "version")
+# Spreadsheet formula prefixes; such cells are quoted with a leading apostrophe.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+logger = logging.getLogger(__name__)
+
+
+def user_masker(key: str) -> Callable[[int], str]:
+    """Keyed pseudonym of a user id; memoised for users seen repeatedly."""
+    if not key:
+        raise ValueError("masking user ids requires EXPORT_MASK_KEY")
+    secret = key.encode()
+
+    @lru_cache(maxsize=65536)
+    def mask(user_id: int) -> str:
+        digest = hmac.new(secret, str(user_id).encode(), hashlib.sha256)
+        return digest.hexdigest()[:16]
+
+    return mask
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _encode_csv(rows: Iterable[tuple]) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return out.getvalue().encode()
+
+
+def _encode_ndjson(rows: Iterable[tuple]) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(COLUMNS, row))) + b"\n" for row in rows)
+
+
+async def export_suggestions(
+    fmt: str = "csv",
+    anonymize: bool = True,
+    gzip: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    mask_key: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the export of every suggestion as encoded (and compressed) chunks.
+
+    user_id is masked under mask_key, EXPORT_MASK_KEY by default.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format: {fmt!r}")
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    if anonymize:
+        mask = user_masker(EXPORT_MASK_KEY if mask_key is None else mask_key)
+    else:
+        mask = None
+    compressor = (
+        zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        if gzip
+        else None
+    )
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if fmt == "csv":
+        yield emit(_encode_csv([COLUMNS]))
+    async for chunk in iter_suggestion_chunks_db(chunk_size):
+        rows: Iterable[tuple] = chunk
+        if mask is not None:
+            rows = [(r[0], mask(r[1]), *r[2:]) for r in chunk]
+        data = emit(encode(rows))
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+async def _main(args) -> None:
+    out = open(args.output, "wb") if args.output != "-" else sys.stdout.buffer
+    try:
+        async for data in export_suggestions(args.format, not args.raw, args.gzip):
+            out.write(data)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        await engine.dispose()
+    logger.info(
+        "exported suggestions: format=%s gzip=%s anonymize=%s",
+        args.format,
+        args.gzip,
+        not args.raw,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument(
+        "--raw", action="store_true", help="keep user_id unmasked (PII, needs approval)"
+    )
+    parser.add_argument("-o", "--output", default="-", help="file, '-' for stdout")
+    args = parser.parse_args()
+    if not args.raw and not EXPORT_MASK_KEY:
+        parser.error("EXPORT_MASK_KEY must be set to mask user_id (or pass --raw)")
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Argon2id password hashing offloaded to a bounded worker pool.
+
+Every hash/verify allocates ``memory_cost`` KiB, so the number of concurrent
+jobs is capped from available memory and excess requests are queued for a
+limited time before being rejected instead of piling up in the threadpool.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
+
+from .metrics import hash_durations, registry
+
+ph = PasswordHasher(
+    time_cost=3, memory_cost=262144, parallelism=1, hash_len=32, salt_len=16
+)
+
+HASH_MEMORY_BYTES = ph.memory_cost * 1024
+HASH_MEMORY_FRACTION = float(os.getenv("HASH_MEMORY_FRACTION", "0.5"))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "32"))
+HASH_QUEUE_TIMEOUT = float(os.getenv("HASH_QUEUE_TIMEOUT", "5"))
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing pool cannot take or start a job in time."""
+
+
+def default_concurrency() -> int:
+    """Number of concurrent hashes that fit in a share of available memory."""
+    cpus = os.cpu_count() or 1
+    try:
+        available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return cpus
+    by_memory = int(available * HASH_MEMORY_FRACTION // HASH_MEMORY_BYTES)
+    return max(1, min(cpus, by_memory))
+
+
+class HashingPool:
+    """Thread pool with admission control; argon2-cffi releases the GIL."""
+
+    def __init__(self, max_workers: int, queue_size: int, queue_timeout: float):
+        self.max_workers = max_workers
+        self.capacity = max_workers + queue_size
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="argon2"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs currently running or waiting for a worker."""
+        return self._in_flight
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the pool, raising HashingBusyError when saturated."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise HashingBusyError("hashing queue is full")
+            self._in_flight += 1
+
+        enqueued_at = time.monotonic()
+
+        def job():
+            if time.monotonic() - enqueued_at > self.queue_timeout:
+                raise HashingBusyError("timed out waiting for a hashing worker")
+            return fn(*args)
+
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+pool = HashingPool(
+    max_workers=int(os.getenv("HASH_MAX_CONCURRENCY", "0")) or default_concurrency(),
+    queue_size=HASH_QUEUE_SIZE,
+    queue_timeout=HASH_QUEUE_TIMEOUT,
+)
+
+
+registry.gauge(
+    "argon2_jobs_in_flight",
+    "Hashing jobs running or queued for a worker.",
+    callback=lambda: pool.in_flight,
+)
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def _verify(password_hash: str, password: str) -> bool:
+    try:
+        return ph.verify(password_hash, password)
+    except VerifyMismatchError:
+        return False
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password with Argon2id on the hashing pool."""
+    password_hash, elapsed = await pool.run(_timed, ph.hash, password)
+    hash_durations.observe(elapsed, "hash")
+    return password_hash
+
+
+async def verify_password(password_hash: str, password: str) -> bool:
+    """Check a password against an Argon2id hash on the hashing pool."""
+    valid, elapsed = await pool.run(_timed, _verify, password_hash, password)
+    hash_durations.observe(elapsed, "verify")
+    return valid
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Whether the hash was produced with outdated parameters (cheap, no hashing)."""
+    return ph.check_needs_rehash(password_hash)
@@ -0,0 +1,116 @@
+"""
+Readiness checks for GET /health/ready.
+
+Each check reports a status and its latency. The combined result is cached for
+READINESS_CACHE_TTL seconds and concurrent probes share one run, so however
+often the orchestrator polls, the database sees at most one ``SELECT 1`` per
+interval. ``/health`` stays a constant liveness answer.
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from .database import DB_MAX_OVERFLOW, DB_POOL_SIZE, ping_db, pool_status
+from .hashing import pool as hashing_pool
+from .writebehind import suggestion_writer
+
+READINESS_CACHE_TTL = float(os.getenv("READINESS_CACHE_TTL", "2"))
+READINESS_DB_TIMEOUT = float(os.getenv("READINESS_DB_TIMEOUT", "1"))
+# Share of pool connections / hashing slots / write queue in use above which the instance
+# reports itself as not ready, so that the balancer sends traffic elsewhere.
+READINESS_SATURATION = float(os.getenv("READINESS_SATURATION", "0.9"))
+
+
+async def check_database() -> dict:
+    try:
+        await asyncio.wait_for(ping_db(), READINESS_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        return {"status": "fail", "error": "timeout"}
+    except Exception as exc:
+        return {"status": "fail", "error": type(exc).__name__}
+    return {"status": "ok"}
+
+
+async def check_db_pool() -> dict:
+    status = pool_status()
+    if status is None:
+        return {"status": "ok"}
+    capacity = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    saturated = status["checked_out"] >= capacity * READINESS_SATURATION
+    return {
+        "status": "fail" if saturated else "ok",
+        "checked_out": status["checked_out"],
+        "capacity": capacity,
+    }
+
+
+async def check_hashing() -> dict:
+    in_flight, capacity = hashing_pool.in_flight, hashing_pool.capacity
+    return {
+        "status": "fail" if in_flight >= capacity * READINESS_SATURATION else "ok",
+        "in_flight": in_flight,
+        "capacity": capacity,
+    }
+
+
+async def check_write_queue() -> dict:
+    queued, capacity = suggestion_writer.queued, suggestion_writer.queue_size
+    return {
+        "status": "fail" if queued >= capacity * READINESS_SATURATION else "ok",
+        "queued": queued,
+        "capacity": capacity,
+    }
+
+
+CHECKS: Dict[str, Callable[[], Awaitable[dict]]] = {
+    "database": check_database,
+    "db_pool": check_db_pool,
+    "hashing": check_hashing,
+    "write_queue": check_write_queue,
+}
+
+
+class ReadinessProbe:
+    """Runs CHECKS at most once per ttl and caches the combined report."""
+
+    def __init__(self, checks=CHECKS, ttl: float = READINESS_CACHE_TTL):
+        self.checks = checks
+        self.ttl = ttl
+        self._report: Optional[dict] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _timed(self, check) -> dict:
+        started = time.perf_counter()
+        result = await check()
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    async def _run(self) -> dict:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._timed(self.checks[n]) for n in names))
+        checks = dict(zip(names, results))
+        ready = all(result["status"] == "ok" for result in checks.values())
+        return {
+            "status": "ready" if ready else "unavailable",
+            "checked_at": time.time(),
+            "checks": checks,
+        }
+
+    async def report(self) -> dict:
+        """The cached report, refreshed by one caller when it has expired."""
+        if time.monotonic() < self._expires_at:
+            return {**self._report, "cached": True}
+        async with self._lock:
+            if time.monotonic() >= self._expires_at:
+                self._report = await self._run()
+                self._expires_at = time.monotonic() + self.ttl
+                return {**self._report, "cached": False}
+        return {**self._report, "cached": True}
+
+    def clear(self) -> None:
+        self._report = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
@@ -0,0 +1,60 @@
+"""
+In-process store behind the /items demo endpoints.
+
+Items are kept in a dict keyed by id, so lookups do not depend on how many
+items there are. Ids come from a counter and are never reused; once
+ITEMS_MAX_ENTRIES items are held, each new item evicts the oldest one. With
+items only ever removed from the oldest end, the live ids form one contiguous
+range, which lets a page after any id be read with ``limit`` lookups.
+
+The endpoints are used as a constant-time baseline in latency benchmarks:
+nothing here touches the database or blocks the event loop.
+"""
+
+import itertools
+import os
+from typing import List, Optional
+
+from .metrics import registry
+
+ITEMS_MAX_ENTRIES = int(os.getenv("ITEMS_MAX_ENTRIES", "10000"))
+
+item_evictions = registry.counter(
+    "items_evicted", "Demo items evicted to stay within ITEMS_MAX_ENTRIES."
+)
+
+
+class ItemStore:
+    """Bounded id -> item mapping with monotonic ids and oldest-first eviction."""
+
+    def __init__(self, max_entries: int = ITEMS_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._items: dict[int, dict] = {}
+        self._ids = itertools.count(1)
+        self._oldest = 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def create(self, name: str) -> dict:
+        item = {"id": next(self._ids), "name": name}
+        self._items[item["id"]] = item
+        while len(self._items) > self.max_entries:
+            del self._items[self._oldest]
+            self._oldest += 1
+            item_evictions.inc()
+        return item
+
+    def get(self, item_id: int) -> Optional[dict]:
+        return self._items.get(item_id)
+
+    def page(self, after: Optional[int] = None, limit: int = 100) -> List[dict]:
+        """Up to limit items with ids greater than after, in id order."""
+        start = self._oldest if after is None else max(after + 1, self._oldest)
+        stop = min(start + limit, self._oldest + len(self._items))
+        return [self._items[item_id] for item_id in range(start, stop)]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._ids = itertools.count(1)
+        self._oldest = 1
@@ -1,24 +1,82 @@
+import hashlib
+import hmac
+import html
+import json
+import logging
 import os
 import time
-from typing import List, Optional
-from uuid import uuid4
+from typing import Callable, List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from . import IMPORT_STARTED, export
+from .cache import suggestion_cache
+from .compression import (
+    COMPRESSION_MIN_SIZE,
+    CompressionMiddleware,
+    choose_encoding,
+    compress,
+)
 from .database import (
+    HIGHLIGHT_END,
+    HIGHLIGHT_START,
+    SCHEMA_VERSION,
+    UnitOfWork,
+    batch_suggestions_db,
     create_suggestion_db,
     create_user_db,
     delete_suggestion_db,
+    get_db,
+    get_schema_version_db,
     get_suggestion_by_id_db,
+    get_suggestion_counts_db,
     get_suggestions_db,
-    get_user_by_username_db,
-    init_db,
+    get_suggestions_version_db,
+    get_user_suggestions_db,
+    iter_suggestions_db,
+    search_suggestions_db,
+    set_suggestions_status_db,
     update_suggestion_db,
     verify_password_db,
 )
-from .entities import SuggestionCreate, SuggestionOut
+from .entities import (
+    BatchResult,
+    SuggestionBatch,
+    SuggestionCreate,
+    SuggestionOut,
+    SuggestionSearchHit,
+    SuggestionStats,
+    SuggestionStatus,
+    SuggestionStatusUpdate,
+)
+from .export import EXPORT_FORMATS, export_suggestions
+from .hashing import HashingBusyError
+from .health import ReadinessProbe
+from .items import ItemStore
+from .metrics import MetricsMiddleware, registry
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_ID,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from .profiling import QueryProfileMiddleware
+from .ratelimit import MemoryRateLimiter, RateLimitMiddleware, create_limiter
+from .serialization import (
+    RawJSONResponse,
+    encode_suggestion,
+    encode_suggestions,
+    render_suggestion,
+    render_suggestions,
+)
+from .stats import CountReconciler
+from .tokens import create_token_issuer
+from .writebehind import WRITE_BEHIND, WriteQueueFullError, suggestion_writer
 
 app = FastAPI(
     title="SecDev Course App",
@@ -27,34 +85,49 @@ app = FastAPI(
 )
 
 
-def cleanup_expired_tokens():
-    """Remove expired tokens from storage."""
-    current_time = time.time()
-    expired_tokens = [
-        token
-        for token, data in _TOKENS.items()
-        if current_time - data["created_at"] > TOKEN_TTL
-    ]
-    for token in expired_tokens:
-        del _TOKENS[token]
-    if expired_tokens:
-        print(f"Cleaned up {len(expired_tokens)} expired tokens")
+logger = logging.getLogger(__name__)
+
+startup_seconds = registry.gauge(
+    "app_startup_seconds", "Time spent starting this worker.", labels=("phase",)
+)
+
+
+_COUNT_RECONCILER = CountReconciler()
 
 
-# Initialize database tables on startup
 @app.on_event("startup")
-def startup_event():
-    init_db()
+async def startup_event():
+    """
+    Verify the schema version and start the periodic counter recount; creating
+    the schema and default users is left to `python -m app.bootstrap`, so
+    workers start without DDL or password hashing.
+    """
+    if EXPORT_TOKEN and not export.EXPORT_MASK_KEY:
+        # A generated key would give every worker and restart other pseudonyms.
+        raise RuntimeError(
+            "EXPORT_MASK_KEY must be set when the export is enabled (EXPORT_TOKEN)"
+        )
+    started = time.perf_counter()
+    version = await get_schema_version_db()
+    if version < SCHEMA_VERSION:
+        raise RuntimeError(
+            f"database schema is at version {version}, expected {SCHEMA_VERSION}; "
+            "run `python -m app.bootstrap` first"
+        )
+    _COUNT_RECONCILER.start()
+    finished = time.perf_counter()
+    startup_seconds.set(started - IMPORT_STARTED, "import")
+    startup_seconds.set(finished - started, "startup")
+    logger.info(
+        "worker ready: import %.1f ms, startup %.1f ms",
+        (started - IMPORT_STARTED) * 1000,
+        (finished - started) * 1000,
+    )
 
-    alice_user = os.getenv("DEFAULT_USER_ALICE", "alice")
-    alice_pass = os.getenv("DEFAULT_PASSWORD_ALICE", "alicepass")
-    bob_user = os.getenv("DEFAULT_USER_BOB", "bob")
-    bob_pass = os.getenv("DEFAULT_PASSWORD_BOB", "bobpass")
 
-    if not get_user_by_username_db(alice_user):
-        create_user_db(alice_user, alice_pass)
-    if not get_user_by_username_db(bob_user):
-        create_user_db(bob_user, bob_pass)
+@app.on_event("shutdown")
+async def shutdown_event():
+    await _COUNT_RECONCILER.stop()
 
 
 class ApiError(Exception):
@@ -72,6 +145,34 @@ async def api_error_handler(request: Request, exc: ApiError):
     )
 
 
+@app.exception_handler(HashingBusyError)
+async def hashing_busy_handler(request: Request, exc: HashingBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={
+            "error": {
+                "code": "service_unavailable",
+                "message": "Authentication service is busy, try again later",
+            }
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(WriteQueueFullError)
+async def write_queue_full_handler(request: Request, exc: WriteQueueFullError):
+    return JSONResponse(
+        status_code=503,
+        content={
+            "error": {
+                "code": "service_unavailable",
+                "message": "Too many suggestions are being saved, try again later",
+            }
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     detail = exc.detail if isinstance(exc.detail, str) else "http_error"
@@ -83,35 +184,53 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 @app.get("/health", tags=["Health"])
 def health():
-    """Health check endpoint."""
+    """Liveness check: the process is up. Does not touch dependencies."""
     return {"status": "ok"}
 
 
-_DB = {"items": []}
-_TOKENS: dict[str, dict] = {}
+_READINESS = ReadinessProbe()
+
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness():
+    """
+    Readiness check: database reachable, connection pool and hashing backlog not
+    saturated. Returns 503 when any check fails.
+    The result is cached for READINESS_CACHE_TTL seconds.
+    """
+    report = await _READINESS.report()
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
+
+@app.get("/cache/stats", tags=["Health"])
+def cache_stats():
+    """Hit/miss counters of the suggestion read cache and its body cache."""
+    return {**suggestion_cache.stats(), "bodies": suggestion_cache.bodies.stats()}
+
+
+_ITEMS = ItemStore()
 TOKEN_TTL = 3600
+_TOKENS = create_token_issuer(TOKEN_TTL)
 
 security = HTTPBearer(
-    auto_error=False, description="JWT Bearer token. Get it from /auth/login endpoint."
+    auto_error=False,
+    description="Bearer token (JWT when TOKEN_FORMAT=jwt). Get it from /auth/login.",
 )
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
-    if len(_TOKENS) > 10:
-        cleanup_expired_tokens()
-
     if not credentials:
         raise ApiError("auth_required", "Authorization required", 401)
-    token = credentials.credentials
-    token_data = _TOKENS.get(token)
+    # Already resolved by the rate limit middleware for per-user limits.
+    token_data = getattr(request.state, "token_data", None)
+    if token_data is None:
+        token_data = await _TOKENS.get(credentials.credentials)
     if not token_data:
         raise ApiError("invalid_token", "Invalid or expired token", 401)
-
-    current_time = time.time()
-    if current_time - token_data["created_at"] > TOKEN_TTL:
-        del _TOKENS[token]
+    if token_data["expires_at"] <= time.time():
         raise ApiError("token_expired", "Token has expired", 401)
 
     return {"id": token_data["user_id"]}
@@ -120,12 +239,96 @@ async def get_current_user(
 RATE_LIMIT_ATTEMPTS = 5
 RATE_LIMIT_WINDOW = 60
 RATE_LIMIT_IP_ATTEMPTS = 10
-_RATE_LIMIT: dict[str, list[float]] = {}
-_RATE_LIMIT_IP: dict[str, list[float]] = {}
+_RATE_LIMIT = create_limiter("login_user", RATE_LIMIT_ATTEMPTS, RATE_LIMIT_WINDOW)
+_RATE_LIMIT_IP = create_limiter("login_ip", RATE_LIMIT_IP_ATTEMPTS, RATE_LIMIT_WINDOW)
+
+# NFR-05: requests per second for the whole service, per user and per IP (0 = off).
+RATE_LIMIT_GLOBAL_RPS = int(os.getenv("RATE_LIMIT_GLOBAL_RPS", "100"))
+RATE_LIMIT_USER_RPS = int(os.getenv("RATE_LIMIT_USER_RPS", "10"))
+RATE_LIMIT_IP_RPS = int(os.getenv("RATE_LIMIT_IP_RPS", "60"))
+RATE_LIMIT_EXEMPT_PATHS = ("/health", "/metrics")
+_REQUEST_LIMITS = {
+    # Always process-local: a shared counter would be one row every request of
+    # every worker updates. The limit applies per worker.
+    "global": MemoryRateLimiter("rps_global", RATE_LIMIT_GLOBAL_RPS, 1),
+    "user": create_limiter("rps_user", RATE_LIMIT_USER_RPS, 1),
+    "ip": create_limiter("rps_ip", RATE_LIMIT_IP_RPS, 1),
+}
+
+app.add_middleware(
+    RateLimitMiddleware,
+    limits=_REQUEST_LIMITS,
+    resolve_token=_TOKENS.get,
+    exempt_paths=RATE_LIMIT_EXEMPT_PATHS,
+)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(QueryProfileMiddleware)
+# Added last so that it wraps everything, including rate-limited responses.
+app.add_middleware(MetricsMiddleware)
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+def _sizes(**objects) -> dict:
+    """len() of every object that keeps its entries in process."""
+    return {name: len(obj) for name, obj in objects.items() if hasattr(obj, "__len__")}
+
+
+registry.gauge(
+    "token_store_size",
+    "Tokens held by the in-process token store.",
+    callback=lambda: _sizes(tokens=_TOKENS.store).get("tokens"),
+)
+registry.gauge(
+    "items_store_size",
+    "Items held by the in-process /items demo store.",
+    callback=lambda: len(_ITEMS),
+)
+registry.gauge(
+    "rate_limiter_keys",
+    "Keys tracked by in-process rate limiters.",
+    labels=("limiter",),
+    callback=lambda: _sizes(
+        login_user=_RATE_LIMIT,
+        login_ip=_RATE_LIMIT_IP,
+        **{f"rps_{name}": limiter for name, limiter in _REQUEST_LIMITS.items()},
+    ),
+)
+registry.counter(
+    "cache_hits",
+    "Suggestion cache hits.",
+    callback=lambda: suggestion_cache.stats()["hits"],
+)
+registry.counter(
+    "cache_misses",
+    "Suggestion cache misses.",
+    callback=lambda: suggestion_cache.stats()["misses"],
+)
+registry.gauge(
+    "cache_entries",
+    "Entries in the in-process suggestion cache.",
+    callback=lambda: suggestion_cache.stats().get("size"),
+)
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Metrics in the Prometheus text format.
+    Requires `Authorization: Bearer <METRICS_TOKEN>` when METRICS_TOKEN is set.
+    """
+    if METRICS_TOKEN and (
+        credentials is None
+        or not hmac.compare_digest(credentials.credentials, METRICS_TOKEN)
+    ):
+        raise ApiError("invalid_token", "metrics token required", 401)
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 @app.post("/auth/login", tags=["Authentication"])
-def login(username: str, password: str, request: Request):
+async def login(username: str, password: str, request: Request):
     """
     Login endpoint with rate limiting (by username and IP) and Argon2id password verification.
 
@@ -136,48 +339,40 @@ def login(username: str, password: str, request: Request):
     Rate limits:
     - Max 5 attempts per 60 seconds per username
     - Max 10 attempts per 60 seconds per IP address
+
+    Returns 503 when the password hashing pool is saturated.
     """
-    now = time.time()
     client_ip = request.client.host if request.client else "unknown"
 
-    attempts = _RATE_LIMIT.get(username, [])
-    attempts = [t for t in attempts if now - t < RATE_LIMIT_WINDOW]
-    _RATE_LIMIT[username] = attempts
-
-    if len(attempts) >= RATE_LIMIT_ATTEMPTS:
+    if await _RATE_LIMIT.exceeded(username):
         raise ApiError(
             "too_many_requests",
             "Too many login attempts for this username, try again later",
             429,
         )
 
-    ip_attempts = _RATE_LIMIT_IP.get(client_ip, [])
-    ip_attempts = [t for t in ip_attempts if now - t < RATE_LIMIT_WINDOW]
-    _RATE_LIMIT_IP[client_ip] = ip_attempts
-
-    if len(ip_attempts) >= RATE_LIMIT_IP_ATTEMPTS:
+    if await _RATE_LIMIT_IP.exceeded(client_ip):
         raise ApiError(
             "too_many_requests",
             "Too many login attempts from this IP address, try again later",
             429,
         )
 
-    user = verify_password_db(username, password)
+    user = await verify_password_db(username, password)
     if not user:
-        _RATE_LIMIT.setdefault(username, []).append(now)
-        _RATE_LIMIT_IP.setdefault(client_ip, []).append(now)
+        await _RATE_LIMIT.add(username)
+        await _RATE_LIMIT_IP.add(client_ip)
         raise ApiError("invalid_credentials", "Invalid username or password", 401)
 
-    _RATE_LIMIT.pop(username, None)
-    _RATE_LIMIT_IP.pop(client_ip, None)
+    await _RATE_LIMIT.reset(username)
+    await _RATE_LIMIT_IP.reset(client_ip)
 
-    token = str(uuid4())
-    _TOKENS[token] = {"user_id": user["id"], "created_at": time.time()}
+    token = await _TOKENS.issue(user["id"])
     return {"access_token": token, "token_type": "bearer", "expires_in": TOKEN_TTL}
 
 
 @app.post("/auth/register", tags=["Authentication"])
-def register(username: str, password: str):
+async def register(username: str, password: str, db: UnitOfWork = Depends(get_db)):
     """
     Register a new user account.
 
@@ -222,12 +417,9 @@ def register(username: str, password: str):
             "validation_error", "password must be at least 8 characters", 422
         )
 
-    if get_user_by_username_db(username):
-        raise ApiError("user_exists", "Username already taken", 409)
-
-    user = create_user_db(username, password)
+    user = await create_user_db(username, password, db=db)
     if not user:
-        raise ApiError("server_error", "Failed to create user", 500)
+        raise ApiError("user_exists", "Username already taken", 409)
 
     return {
         "id": user["id"],
@@ -237,7 +429,7 @@ def register(username: str, password: str):
 
 
 @app.post("/auth/logout", tags=["Authentication"])
-def logout(
+async def logout(
     current_user=Depends(get_current_user),
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
@@ -245,13 +437,12 @@ def logout(
     Logout endpoint - invalidates current JWT token.
     Requires Bearer token in Authorization header.
     """
-    token = credentials.credentials
-    _TOKENS.pop(token, None)
+    await _TOKENS.revoke(credentials.credentials)
     return {"status": "logged_out"}
 
 
 @app.get("/auth/token-info", tags=["Authentication"])
-def token_info(
+async def token_info(
     current_user=Depends(get_current_user),
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
@@ -259,8 +450,7 @@ def token_info(
     Get information about current token including time to live.
     Requires Bearer token in Authorization header.
     """
-    token = credentials.credentials
-    token_data = _TOKENS.get(token)
+    token_data = await _TOKENS.get(credentials.credentials)
     if not token_data:
         raise ApiError("invalid_token", "Token not found", 401)
 
@@ -277,110 +467,498 @@ def token_info(
 
 
 @app.post("/items", tags=["Items (Demo)"])
-def create_item(name: str):
+async def create_item(name: str):
     """Create item."""
     if not name or len(name) > 100:
         raise ApiError(
             code="validation_error", message="name must be 1..100 chars", status=422
         )
-    item = {"id": len(_DB["items"]) + 1, "name": name}
-    _DB["items"].append(item)
-    return item
+    return _ITEMS.create(name)
+
+
+@app.get("/items", tags=["Items (Demo)"])
+async def list_items(
+    response: Response,
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"
+    ),
+    after: Optional[str] = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+):
+    """
+    List items ordered by id.
+
+    Paginated like `GET /suggestions`: when more items are available the
+    response carries an `X-Next-Cursor` header to pass as `after`.
+    """
+    after_id = None
+    if after is not None:
+        try:
+            after_id = decode_cursor(after)
+        except ValueError:
+            raise ApiError("validation_error", "invalid pagination cursor", 422)
+
+    items = _ITEMS.page(after_id, limit + 1)
+    if len(items) > limit:
+        items = items[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(items[-1]["id"])
+    return items
 
 
 @app.get("/items/{item_id}", tags=["Items (Demo)"])
-def get_item(item_id: int):
+async def get_item(item_id: int):
     """Get item by ID."""
-    for it in _DB["items"]:
-        if it["id"] == item_id:
-            return it
-    raise ApiError(code="not_found", message="item not found", status=404)
+    item = _ITEMS.get(item_id)
+    if item is None:
+        raise ApiError(code="not_found", message="item not found", status=404)
+    return item
 
 
-@app.post("/suggestions", response_model=SuggestionOut, tags=["Suggestions"])
-def create_suggestion(s: SuggestionCreate, current_user=Depends(get_current_user)):
-    """
-    Create a new suggestion.
-    Requires authentication - use Bearer token from /auth/login.
-    """
+def _validate_suggestion(s: SuggestionCreate) -> None:
     if not s.title or len(s.title) > 200:
         raise ApiError("validation_error", "title must be 1..200 chars", 422)
     if not s.text or len(s.text) > 2000:
         raise ApiError("validation_error", "text must be 1..2000 chars", 422)
 
-    suggestion = create_suggestion_db(
+
+@app.post("/suggestions", response_model=SuggestionOut, tags=["Suggestions"])
+async def create_suggestion(
+    s: SuggestionCreate,
+    current_user=Depends(get_current_user),
+    db: UnitOfWork = Depends(get_db),
+):
+    """
+    Create a new suggestion.
+    Requires authentication - use Bearer token from /auth/login.
+    """
+    _validate_suggestion(s)
+    fields = dict(
         user_id=current_user["id"], title=s.title, text=s.text, status=s.status or "new"
     )
-    return suggestion
+    if WRITE_BEHIND:
+        # Written with the next batch, on the writer's connection.
+        return await suggestion_writer.create(**fields)
+    return await create_suggestion_db(**fields, db=db)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of etag against the If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _set_validators(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    _set_validators(response, etag)
+    return response
+
+
+async def _stream_ndjson(rows):
+    """One SuggestionOut object per line; rows hold just the SUGGESTION_FIELDS."""
+    async for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+# Skip response_model validation and encode list pages with orjson.
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() == "true"
+
+
+async def _cached_body(
+    request: Request, response: Response, key: str, encode: Callable[[], bytes]
+) -> Optional[Response]:
+    """
+    Response for a cached read sent compressed, None to respond the regular way.
+
+    The body is compressed once per encoding and stored in the cache next to the
+    rows under key, so hot reads skip both serialisation and compression. encode
+    renders the body with orjson under FAST_JSON and like response_model otherwise.
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding is None:
+        return None
+
+    def render():
+        body = encode()
+        if len(body) < COMPRESSION_MIN_SIZE:
+            return None, body
+        return encoding, compress(body, encoding)
+
+    used, body = await suggestion_cache.get_body(key, encoding, render)
+    headers = dict(response.headers)
+    if used:
+        headers.update({"Content-Encoding": used, "Vary": "Accept-Encoding"})
+    return RawJSONResponse(body, headers=headers)
+
+
+def _suggestion_page(rows: List[dict], response: Response):
+    """Return rows for FastAPI to serialise, or pre-encoded with FAST_JSON."""
+    if not FAST_JSON:
+        return rows
+    return RawJSONResponse(encode_suggestions(rows), headers=dict(response.headers))
 
 
 @app.get("/suggestions", response_model=List[SuggestionOut], tags=["Suggestions"])
-def list_suggestions(
+async def list_suggestions(
+    request: Request,
+    response: Response,
     status: Optional[str] = Query(
         None, description="Filter by status (e.g., 'new', 'reviewed')"
+    ),
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"
+    ),
+    after: Optional[str] = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    stream: bool = Query(
+        False, description="Stream every matching suggestion as NDJSON (ignores limit)"
+    ),
+    db: UnitOfWork = Depends(get_db),
+):
+    """
+    Get suggestions ordered by id, optionally filtered by status.
+    No authentication required.
+
+    Results are paginated with a keyset cursor: when more rows are available the
+    response carries an `X-Next-Cursor` header to pass as `after` for the next page.
+    With `stream=true` all matching rows are streamed as `application/x-ndjson`.
+
+    Pages carry an `ETag` derived from the list version; send it back in
+    `If-None-Match` to get `304 Not Modified` while nothing has changed.
+    """
+    after_id = None
+    if after is not None:
+        try:
+            after_id = decode_cursor(after)
+        except ValueError:
+            raise ApiError("validation_error", "invalid pagination cursor", 422)
+
+    if stream:
+        return StreamingResponse(
+            _stream_ndjson(iter_suggestions_db(status=status, after=after_id)),
+            media_type="application/x-ndjson",
+        )
+
+    version = await get_suggestions_version_db(status, db=db)
+    fingerprint = f"{status}|{after_id}|{limit}|{version}".encode()
+    etag = f'W/"{hashlib.sha256(fingerprint).hexdigest()[:20]}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    # Only the first page at the default size is cached. Cursors and page sizes
+    # come from anonymous callers, who could otherwise fill the cache (bounded
+    # by entry count, not size) with pages of up to MAX_PAGE_SIZE rows.
+    cacheable = after_id is None and limit == DEFAULT_PAGE_SIZE
+    suggestions = await get_suggestions_db(
+        status=status,
+        limit=limit + 1,
+        after=after_id,
+        version=version if cacheable else None,
+        db=db,
     )
+    _set_validators(response, etag)
+    if len(suggestions) > limit:
+        suggestions = suggestions[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(suggestions[-1]["id"])
+    compressed = None
+    if cacheable:
+        compressed = await _cached_body(
+            request,
+            response,
+            suggestion_cache.page_key(status, after_id, limit + 1, version),
+            lambda: (encode_suggestions if FAST_JSON else render_suggestions)(
+                suggestions
+            ),
+        )
+    return compressed or _suggestion_page(suggestions, response)
+
+
+@app.get("/suggestions/mine", response_model=List[SuggestionOut], tags=["Suggestions"])
+async def list_my_suggestions(
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by status"),
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"
+    ),
+    after: Optional[str] = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    current_user=Depends(get_current_user),
+    db: UnitOfWork = Depends(get_db),
 ):
     """
-    Get all suggestions, optionally filtered by status.
+    Get the current user's suggestions ordered by id, optionally filtered by status.
+    Requires authentication. Paginated like `GET /suggestions`.
+    """
+    after_id = None
+    if after is not None:
+        try:
+            after_id = decode_cursor(after)
+        except ValueError:
+            raise ApiError("validation_error", "invalid pagination cursor", 422)
+
+    suggestions = await get_user_suggestions_db(
+        current_user["id"], status=status, limit=limit + 1, after=after_id, db=db
+    )
+    if len(suggestions) > limit:
+        suggestions = suggestions[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(suggestions[-1]["id"])
+    return _suggestion_page(suggestions, response)
+
+
+EXPORT_TOKEN = os.getenv("EXPORT_TOKEN", "")
+
+
+@app.get("/suggestions/export", tags=["Suggestions"])
+async def export_suggestions_endpoint(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    anonymize: bool = Query(True, description="Mask user_id with a keyed hash"),
+    gzip: bool = Query(False, description="Download as a .gz file"),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    """
+    Stream every suggestion as CSV or NDJSON, with user_id masked by default.
+    Requires `Authorization: Bearer <EXPORT_TOKEN>`; disabled when EXPORT_TOKEN is
+    not set. Every export is logged for audit.
+    """
+    if not EXPORT_TOKEN:
+        raise ApiError("forbidden", "export is disabled", 403)
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials, EXPORT_TOKEN
+    ):
+        raise ApiError("invalid_token", "export token required", 401)
+
+    logger.info(
+        "suggestions export: format=%s gzip=%s anonymize=%s client=%s",
+        format,
+        gzip,
+        anonymize,
+        request.client.host if request.client else "unknown",
+    )
+    filename = f"suggestions.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_suggestions(format, anonymize=anonymize, gzip=gzip),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _render_highlight(fragment: str) -> str:
+    """HTML-escape a highlighted fragment and mark matches with <mark>."""
+    return (
+        html.escape(fragment)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_END, "</mark>")
+    )
+
+
+@app.get(
+    "/suggestions/search",
+    response_model=List[SuggestionSearchHit],
+    tags=["Suggestions"],
+)
+async def search_suggestions(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"
+    ),
+    after: Optional[str] = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    db: UnitOfWork = Depends(get_db),
+):
+    """
+    Full-text search over suggestion title and text, best matches first.
     No authentication required.
+
+    Every word of `q` must match. `title_highlight` and `snippet` are HTML-escaped
+    with matches wrapped in `<mark>`. Paginated like `GET /suggestions`.
     """
-    return get_suggestions_db(status=status)
+    after_key = None
+    if after is not None:
+        try:
+            after_key = decode_rank_cursor(after)
+        except ValueError:
+            raise ApiError("validation_error", "invalid pagination cursor", 422)
+
+    hits = await search_suggestions_db(
+        q, status=status, limit=limit + 1, after=after_key, db=db
+    )
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers["X-Next-Cursor"] = encode_rank_cursor(
+            hits[-1]["rank"], hits[-1]["id"]
+        )
+    for hit in hits:
+        hit["title_highlight"] = _render_highlight(hit["title_highlight"])
+        hit["snippet"] = _render_highlight(hit["snippet"])
+    return hits
+
+
+@app.get("/suggestions/stats", response_model=SuggestionStats, tags=["Suggestions"])
+async def suggestion_stats(
+    user_id: Optional[int] = Query(
+        None, ge=1, le=MAX_ID, description="Count only this user's suggestions"
+    ),
+    db: UnitOfWork = Depends(get_db),
+):
+    """
+    Number of suggestions by status, overall or of one user.
+    No authentication required.
+
+    Read from counters maintained on every write, so the cost does not grow with
+    the number of suggestions.
+    """
+    counts = await get_suggestion_counts_db(user_id, db=db)
+    by_status = {status.value: 0 for status in SuggestionStatus}
+    by_status.update(counts)
+    return {"user_id": user_id, "total": sum(counts.values()), "by_status": by_status}
 
 
 @app.get(
     "/suggestions/{suggestion_id}", response_model=SuggestionOut, tags=["Suggestions"]
 )
-def get_suggestion(suggestion_id: int):
+async def get_suggestion(
+    suggestion_id: int,
+    request: Request,
+    response: Response,
+    db: UnitOfWork = Depends(get_db),
+):
     """
     Get suggestion by ID.
     No authentication required.
+
+    Supports `If-None-Match` with the `ETag` of a previous response (row version).
     """
-    suggestion = get_suggestion_by_id_db(suggestion_id)
+    suggestion = await get_suggestion_by_id_db(suggestion_id, db=db)
     if not suggestion:
         raise ApiError("not_found", "suggestion not found", 404)
-    return suggestion
+    etag = f'W/"{suggestion_id}.{suggestion["version"]}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    _set_validators(response, etag)
+    compressed = await _cached_body(
+        request,
+        response,
+        suggestion_cache.suggestion_key(suggestion_id),
+        lambda: (encode_suggestion if FAST_JSON else render_suggestion)(suggestion),
+    )
+    return compressed or suggestion
+
+
+def _raise_for_outcome(outcome: str) -> None:
+    """Turn the outcome of an owner-scoped write into an API error."""
+    if outcome == "not_found":
+        raise ApiError("not_found", "suggestion not found", 404)
+    if outcome == "forbidden":
+        raise ApiError("forbidden", "You are not the owner of this suggestion", 403)
 
 
 @app.put(
     "/suggestions/{suggestion_id}", response_model=SuggestionOut, tags=["Suggestions"]
 )
-def update_suggestion(
-    suggestion_id: int, s: SuggestionCreate, current_user=Depends(get_current_user)
+async def update_suggestion(
+    suggestion_id: int,
+    s: SuggestionCreate,
+    current_user=Depends(get_current_user),
+    db: UnitOfWork = Depends(get_db),
 ):
     """
     Update suggestion by ID (only owner can update).
     Requires authentication - use Bearer token from /auth/login.
     Returns 403 if you try to update someone else's suggestion.
     """
-    suggestion = get_suggestion_by_id_db(suggestion_id)
-    if not suggestion:
-        raise ApiError("not_found", "suggestion not found", 404)
-
-    if suggestion["user_id"] != current_user["id"]:
-        raise ApiError("forbidden", "You are not the owner of this suggestion", 403)
-
-    updated = update_suggestion_db(
+    outcome, updated = await update_suggestion_db(
         suggestion_id=suggestion_id,
+        user_id=current_user["id"],
         title=s.title,
         text=s.text,
-        status=s.status or suggestion["status"],
+        status=s.status,
+        db=db,
     )
+    _raise_for_outcome(outcome)
     return updated
 
 
 @app.delete("/suggestions/{suggestion_id}", tags=["Suggestions"])
-def delete_suggestion(suggestion_id: int, current_user=Depends(get_current_user)):
+async def delete_suggestion(
+    suggestion_id: int,
+    current_user=Depends(get_current_user),
+    db: UnitOfWork = Depends(get_db),
+):
     """
     Delete suggestion by ID (only owner can delete).
     Requires authentication - use Bearer token from /auth/login.
     Returns 403 if you try to delete someone else's suggestion.
     """
-    suggestion = get_suggestion_by_id_db(suggestion_id)
-    if not suggestion:
-        raise ApiError("not_found", "suggestion not found", 404)
+    outcome = await delete_suggestion_db(suggestion_id, current_user["id"], db=db)
+    _raise_for_outcome(outcome)
+    return {"status": "deleted"}
 
-    if suggestion["user_id"] != current_user["id"]:
-        raise ApiError("forbidden", "You are not the owner of this suggestion", 403)
 
-    delete_suggestion_db(suggestion_id)
-    return {"status": "deleted"}
+@app.post("/suggestions:batch", response_model=BatchResult, tags=["Suggestions"])
+async def batch_suggestions(
+    batch: SuggestionBatch,
+    current_user=Depends(get_current_user),
+    db: UnitOfWork = Depends(get_db),
+):
+    """
+    Create, update and delete several suggestions in one transaction.
+    Requires authentication - use Bearer token from /auth/login.
+
+    Updates and deletes apply only to your own suggestions; every item gets a
+    result of `created`, `updated`, `deleted`, `not_found` or `forbidden`.
+    """
+    for s in [*batch.create, *batch.update]:
+        _validate_suggestion(s)
+
+    results = await batch_suggestions_db(
+        user_id=current_user["id"],
+        create=[
+            {"title": s.title, "text": s.text, "status": s.status or "new"}
+            for s in batch.create
+        ],
+        update=[
+            {"id": s.id, "title": s.title, "text": s.text, "status": s.status}
+            for s in batch.update
+        ],
+        delete=batch.delete,
+        db=db,
+    )
+    return {"results": results}
+
+
+@app.patch("/suggestions/status", response_model=BatchResult, tags=["Suggestions"])
+async def set_suggestions_status(
+    body: SuggestionStatusUpdate,
+    current_user=Depends(get_current_user),
+    db: UnitOfWork = Depends(get_db),
+):
+    """
+    Move several of your suggestions to a new status with a single UPDATE.
+    Requires authentication - use Bearer token from /auth/login.
+
+    Every id gets a result of `updated`, `not_found` or `forbidden`.
+    """
+    results = await set_suggestions_status_db(
+        user_id=current_user["id"], ids=body.ids, status=body.status, db=db
+    )
+    return {"results": results}
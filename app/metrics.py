@@ -0,0 +1,316 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+Metrics are plain Python numbers updated without locks: HTTP middleware,
+SQLAlchemy engine/pool events (the async drivers run them in the event loop
+thread) and hashing timings all record from the event loop. Histograms keep
+per-bucket counts and cumulate them only when scraped; gauges whose value
+lives elsewhere (pool status, store sizes) are read at scrape time by
+callbacks, so they cost nothing per request.
+"""
+
+import bisect
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    text = ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return "{" + text + "}" if text else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """A named metric family with a fixed set of label names."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        """Yield (name suffix, label values, value) for every series."""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for suffix, values, value in self.samples():
+            pairs = list(zip(self.labels, values))
+            if suffix == "_bucket":
+                pairs.append(("le", values[-1]))
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(pairs)} {_format_value(value)}"
+            )
+        return lines
+
+
+class _Value(Metric):
+    """Counter/gauge values kept here or computed at scrape time by a callback.
+
+    A callback returns a number, a {label value(s): number} mapping, or None to
+    omit the metric.
+    """
+
+    suffix = ""
+
+    def __init__(self, *args, callback: Optional[Callable] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        values = self._values
+        if self.callback is not None:
+            result = self.callback()
+            if result is None:
+                values = {}
+            elif isinstance(result, dict):
+                values = {
+                    k if isinstance(k, tuple) else (k,): v for k, v in result.items()
+                }
+            else:
+                values = {(): result}
+        for labels, value in list(values.items()):
+            yield self.suffix, labels, value
+
+
+class Counter(_Value):
+    type = "counter"
+    suffix = "_total"
+
+
+class Gauge(_Value):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (+Inf last), then the sum.
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        for labels, series in list(self._series.items()):
+            series = list(series)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else repr(bound)
+                yield "_bucket", labels + (le,), cumulative
+            yield "_sum", labels, series[-1]
+            yield "_count", labels, cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labels=(), callback=None
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labels, callback=callback))
+
+    def gauge(self, name: str, documentation: str, labels=(), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labels, callback=callback))
+
+    def histogram(
+        self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets=buckets))
+
+    def get(self, name: str) -> Metric:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code.",
+    labels=("route", "method", "status"),
+)
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."
+)
+db_statements = registry.histogram(
+    "db_statement_duration_seconds",
+    "Database statement execution time by operation and table.",
+    labels=("operation", "table"),
+    buckets=DB_BUCKETS,
+)
+db_errors = registry.counter(
+    "db_statement_errors", "Database statements that raised.", labels=("operation",)
+)
+db_pool_checkouts = registry.counter(
+    "db_pool_checkouts", "Connections checked out of the pool."
+)
+db_pool_connects = registry.counter(
+    "db_pool_connects", "New DBAPI connections opened by the pool."
+)
+db_pool_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    buckets=DB_BUCKETS,
+)
+hash_durations = registry.histogram(
+    "argon2_duration_seconds",
+    "Argon2 hash/verify time on a worker, excluding queueing.",
+    labels=("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency per route template and in-flight count."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            # Unmatched paths share one label so scans cannot blow up cardinality.
+            route = scope.get("route")
+            http_requests.observe(
+                time.perf_counter() - started,
+                getattr(route, "path", "unmatched"),
+                scope["method"],
+                status,
+            )
+
+
+_DML = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+\"?(\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def statement_labels(statement: str) -> Tuple[str, str]:
+    """(operation, first table) of a SQL statement; cached per statement text."""
+    words = statement.split(None, 1)
+    operation = words[0].upper() if words else "OTHER"
+    if operation not in _DML:
+        return operation, ""
+    match = _TABLE_RE.search(statement)
+    return operation, match.group(1) if match else ""
+
+
+def instrument_engine(engine) -> None:
+    """Attach statement timing and pool events to an (async) engine."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            db_statements.observe(
+                time.perf_counter() - started, *statement_labels(statement)
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        statement = exception_context.statement or ""
+        db_errors.inc(statement_labels(statement)[0] if statement else "OTHER")
+
+    @event.listens_for(sync_engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkouts.inc()
+
+    @event.listens_for(sync_engine.pool, "connect")
+    def _connect(dbapi_connection, connection_record):
+        db_pool_connects.inc()
+
+
+def timed_pool(pool_class):
+    """Subclass a QueuePool so that waiting for a connection is measured."""
+
+    class TimedPool(pool_class):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                db_pool_wait.observe(time.perf_counter() - started)
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
@@ -0,0 +1,191 @@
+"""
+Versioned schema migrations.
+
+A fresh database is created from the metadata in app.database and stamped with
+SCHEMA_VERSION, so it has nothing to migrate. An existing database applies the
+MIGRATIONS newer than the version recorded in ``schema_version``, in order, and
+records each one once it succeeds. New tables come from the metadata
+(create_all only adds what is missing); migrations change existing tables.
+
+Every migration is idempotent, since non-transactional steps such as
+``CREATE INDEX CONCURRENTLY`` cannot be rolled back and may have to be re-run
+after a failure. Run through the bootstrap command, which holds the advisory
+lock:
+
+    python -m app.bootstrap
+"""
+
+import time
+from typing import Awaitable, Callable, List, Sequence
+
+from sqlalchemy import inspect, text
+
+from .database import (
+    COUNTS_DDL,
+    SEARCH_DDL,
+    SEARCH_INDEX,
+    engine,
+    get_schema_version_db,
+    init_db,
+    recount_suggestion_counts,
+    schema_version_table,
+    search_vector_sql,
+)
+
+# Rows per transaction when backfilling a new column on a live table.
+BACKFILL_BATCH_SIZE = 1000
+
+
+class Migration:
+    """One schema change, applied on its own connection."""
+
+    def __init__(
+        self,
+        version: int,
+        description: str,
+        upgrade: Callable[[object], Awaitable[None]],
+        transactional: bool = True,
+    ):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+        # Postgres refuses CREATE/DROP INDEX CONCURRENTLY inside a transaction.
+        self.transactional = transactional
+
+
+async def _columns(conn, table: str) -> List[str]:
+    return await conn.run_sync(
+        lambda sync_conn: [c["name"] for c in inspect(sync_conn).get_columns(table)]
+    )
+
+
+async def create_index(
+    conn, name: str, table: str, columns: Sequence[str], using: str = ""
+) -> None:
+    """Build an index without blocking writes to the table on Postgres."""
+    target = f"{table}{f' USING {using}' if using else ''} ({', '.join(columns)})"
+    if conn.dialect.name != "postgresql":
+        await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+        return
+    # An interrupted concurrent build leaves an INVALID index behind that
+    # IF NOT EXISTS would keep; drop it and build again.
+    valid = await conn.scalar(
+        text(
+            "SELECT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ),
+        {"name": name},
+    )
+    if valid is False:
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    await conn.execute(
+        text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+    )
+
+
+async def drop_index(conn, name: str) -> None:
+    concurrently = " CONCURRENTLY" if conn.dialect.name == "postgresql" else ""
+    await conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
+
+
+async def _baseline(conn) -> None:
+    """
+    Bring a database created before versioning up to the version 1 schema.
+
+    Runs outside a transaction so that no step holds a lock for long on
+    Postgres: the new columns are catalog-only changes, the search vectors of
+    existing rows are filled in small batches and the index is built
+    concurrently.
+    """
+    if "version" not in await _columns(conn, "suggestions"):
+        # A constant default is stored in the catalog, not written to each row.
+        await conn.execute(
+            text(
+                "ALTER TABLE suggestions ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+            )
+        )
+    for statement in SEARCH_DDL.get(conn.dialect.name, []):
+        await conn.exec_driver_sql(statement)
+    if conn.dialect.name == "sqlite":
+        # The FTS table was created empty next to existing rows.
+        await conn.execute(
+            text("INSERT INTO suggestions_fts(suggestions_fts) VALUES ('rebuild')")
+        )
+    elif conn.dialect.name == "postgresql":
+        # New rows get their vector from the trigger installed above.
+        while True:
+            result = await conn.execute(
+                text(
+                    f"UPDATE suggestions SET search_vector = {search_vector_sql()} "
+                    "WHERE id IN (SELECT id FROM suggestions "
+                    "WHERE search_vector IS NULL ORDER BY id LIMIT :batch)"
+                ),
+                {"batch": BACKFILL_BATCH_SIZE},
+            )
+            if result.rowcount == 0:
+                break
+        await create_index(
+            conn, SEARCH_INDEX, "suggestions", ["search_vector"], using="GIN"
+        )
+
+
+async def _composite_list_indexes(conn) -> None:
+    """Replace the single-column status/user_id indexes with (column, id) ones."""
+    await create_index(
+        conn, "ix_suggestions_status_id", "suggestions", ["status", "id"]
+    )
+    await create_index(
+        conn, "ix_suggestions_user_id_id", "suggestions", ["user_id", "id"]
+    )
+    # Both are prefixes of the new indexes, which serve every query they did.
+    await drop_index(conn, "ix_suggestions_status")
+    await drop_index(conn, "ix_suggestions_user_id")
+
+
+async def _suggestion_counts(conn) -> None:
+    """Install the counter triggers (idempotent) and count existing suggestions."""
+    for statement in COUNTS_DDL.get(conn.dialect.name, []):
+        await conn.exec_driver_sql(statement)
+    await recount_suggestion_counts(conn)
+
+
+MIGRATIONS = [
+    Migration(
+        1,
+        "baseline: version column and full-text search",
+        _baseline,
+        transactional=False,
+    ),
+    Migration(
+        2,
+        "composite (status, id) and (user_id, id) indexes",
+        _composite_list_indexes,
+        transactional=False,
+    ),
+    Migration(3, "suggestion counts by owner and status", _suggestion_counts),
+]
+
+
+async def _apply(migration: Migration) -> None:
+    async with engine.connect() as conn:
+        if not migration.transactional:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await migration.upgrade(conn)
+        await conn.execute(
+            schema_version_table.insert().values(
+                version=migration.version, applied_at=time.time()
+            )
+        )
+        await conn.commit()
+
+
+async def migrate() -> List[int]:
+    """Create missing tables and apply pending migrations; returns their versions."""
+    await init_db()
+    current = await get_schema_version_db()
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version > current:
+            await _apply(migration)
+            applied.append(migration.version)
+    return applied
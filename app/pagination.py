@@ -0,0 +1,64 @@
+"""
+Opaque keyset cursors for paginated list endpoints.
+"""
+
+import base64
+import binascii
+import json
+import math
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Largest value of the Integer id columns; larger ids overflow the drivers.
+MAX_ID = 2**31 - 1
+
+
+def _encode(data: dict) -> str:
+    payload = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(data, dict):
+        raise ValueError("invalid cursor")
+    last_id = data.get("id")
+    if (
+        not isinstance(last_id, int)
+        or isinstance(last_id, bool)
+        or not 0 <= last_id <= MAX_ID
+    ):
+        raise ValueError("invalid cursor")
+    return data
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the id of the last returned row as an opaque cursor."""
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed."""
+    return _decode(cursor)["id"]
+
+
+def encode_rank_cursor(rank: float, last_id: int) -> str:
+    """Encode the (rank, id) of the last row of a relevance-ordered page."""
+    return _encode({"rank": rank, "id": last_id})
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """Decode a cursor produced by encode_rank_cursor."""
+    data = _decode(cursor)
+    rank = data.get("rank")
+    if (
+        not isinstance(rank, (int, float))
+        or isinstance(rank, bool)
+        or not math.isfinite(rank)
+    ):
+        raise ValueError("invalid cursor")
+    return float(rank), data["id"]
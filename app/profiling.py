@@ -0,0 +1,156 @@
+"""
+Per-request database profiling.
+
+``QueryProfileMiddleware`` gives every HTTP request a ``RequestProfile`` that
+SQLAlchemy engine and pool events fill in: statements executed, time spent in
+them and connections checked out of the pool. When the request is done it
+warns about requests that checked out more than one connection and about
+statements repeated DB_N_PLUS_ONE_THRESHOLD times or more (the N+1 pattern: a
+query per item instead of one for all of them). With DB_PROFILE_HEADER=true the
+figures are also sent back in an ``X-DB-Profile`` response header.
+
+Independently of requests, statements slower than DB_SLOW_QUERY_MS are logged
+with their parameter values redacted.
+"""
+
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+DB_PROFILE_HEADER = os.getenv("DB_PROFILE_HEADER", "false").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    """Database work done on behalf of one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.checkouts = 0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int):
+        """(statement, count) pairs executed at least threshold times."""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+    def header(self) -> str:
+        return (
+            f"queries={self.queries}; db_ms={self.db_seconds * 1000:.3f}; "
+            f"checkouts={self.checkouts}"
+        )
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "db_request_profile", default=None
+)
+
+
+def redact(parameters, executemany: bool = False) -> object:
+    """Parameter structure with every value replaced by '?'."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: "?" for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        return tuple("?" for _ in parameters)
+    return "?"
+
+
+def _shorten(statement: str, limit: int = 500) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def profile_engine(engine) -> None:
+    """Attach request profiling and the slow-query log to an (async) engine."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._profile_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_profile_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        profile = _current.get()
+        if profile is not None:
+            profile.record(statement, seconds)
+        if DB_SLOW_QUERY_MS >= 0 and seconds * 1000 >= DB_SLOW_QUERY_MS:
+            logger.warning(
+                "slow query (%.1f ms): %s params=%s",
+                seconds * 1000,
+                _shorten(statement),
+                redact(parameters, executemany),
+            )
+
+    @event.listens_for(sync_engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        profile = _current.get()
+        if profile is not None:
+            profile.checkouts += 1
+
+
+class QueryProfileMiddleware:
+    """ASGI middleware collecting a RequestProfile for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        header = DB_PROFILE_HEADER
+
+        async def send_wrapper(message):
+            if header and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-profile", profile.header().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._report(scope, profile)
+
+    def _report(self, scope, profile: RequestProfile) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        if profile.checkouts > 1:
+            logger.warning(
+                "%s %s checked out %d connections (%d queries, %.1f ms)",
+                scope["method"],
+                route,
+                profile.checkouts,
+                profile.queries,
+                profile.db_seconds * 1000,
+            )
+        for statement, count in profile.repeated(DB_N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                "%s %s ran the same statement %d times, possible N+1: %s",
+                scope["method"],
+                route,
+                count,
+                _shorten(statement, 200),
+            )
@@ -0,0 +1,326 @@
+"""
+Sliding-window rate limiters with bounded memory.
+
+A window is split into fixed slices and every key keeps one small counter per
+slice, so memory per key is constant no matter how many hits it receives.
+Hits are forgotten between ``window`` and ``window + window / buckets``
+seconds after they happened (the estimate errs on the strict side).
+
+``MemoryRateLimiter`` keeps counters in an LRU that also drops idle keys;
+``SqlRateLimiter`` keeps them in the ``rate_limits`` table so that limits hold
+across workers; its ``acquire`` checks and records a hit in one atomic
+statement, and ``acquire_all`` records the hits of several SQL limiters in one
+transaction.
+
+``RateLimitMiddleware`` applies the per-request limits (NFR-05) to every HTTP
+request outside the exempt paths.
+"""
+
+import json
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, Mapping, Optional, Sequence, Tuple
+
+from .database import (
+    acquire_rate_limit_hits_db,
+    add_rate_limit_hit_db,
+    count_rate_limit_hits_db,
+    delete_rate_limit_db,
+    purge_rate_limits_db,
+)
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_BUCKETS = 10
+RATE_LIMIT_PURGE_INTERVAL = float(os.getenv("RATE_LIMIT_PURGE_INTERVAL", "60"))
+
+
+class RateLimiter(ABC):
+    """Interface shared by rate limiter backends."""
+
+    def __init__(
+        self, name: str, limit: int, window: float, buckets: int = RATE_LIMIT_BUCKETS
+    ):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.buckets = buckets
+        self.slot_width = window / buckets
+
+    def _slot(self, now: float) -> int:
+        return math.floor(now / self.slot_width)
+
+    @abstractmethod
+    async def count(self, key: str) -> int:
+        """Number of hits recorded for key within the window."""
+
+    @abstractmethod
+    async def add(self, key: str) -> None:
+        """Record a hit for key."""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Forget every hit recorded for key."""
+
+    async def exceeded(self, key: str) -> bool:
+        return await self.count(key) >= self.limit
+
+    async def acquire(self, key: str) -> bool:
+        """Record a hit unless the key is already at its limit."""
+        if await self.exceeded(key):
+            return False
+        await self.add(key)
+        return True
+
+
+class _Counter:
+    __slots__ = ("slot", "counts")
+
+    def __init__(self, slot: int, size: int):
+        self.slot = slot
+        self.counts = [0] * size
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Process-local limiter with LRU/idle eviction of keys."""
+
+    def __init__(self, *args, max_keys: int = RATE_LIMIT_MAX_KEYS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_keys = max_keys
+        self._counters: OrderedDict[str, _Counter] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _evict(self, slot: int) -> None:
+        counters = self._counters
+        while counters and (
+            len(counters) > self.max_keys
+            or slot - next(iter(counters.values())).slot > self.buckets
+        ):
+            counters.popitem(last=False)
+
+    def _advance(self, counter: _Counter, slot: int) -> None:
+        size = len(counter.counts)
+        if slot - counter.slot >= size:
+            counter.counts = [0] * size
+        else:
+            for s in range(counter.slot + 1, slot + 1):
+                counter.counts[s % size] = 0
+        counter.slot = slot
+
+    def _get(self, key: str, slot: int, create: bool):
+        counter = self._counters.get(key)
+        if counter is None:
+            if create:
+                counter = self._counters[key] = _Counter(slot, self.buckets + 1)
+        else:
+            self._counters.move_to_end(key)
+            if slot > counter.slot:
+                self._advance(counter, slot)
+        self._evict(slot)
+        return counter
+
+    async def count(self, key: str) -> int:
+        counter = self._get(key, self._slot(time.time()), create=False)
+        return sum(counter.counts) if counter else 0
+
+    async def add(self, key: str) -> None:
+        slot = self._slot(time.time())
+        counter = self._get(key, slot, create=True)
+        counter.counts[slot % len(counter.counts)] += 1
+
+    async def reset(self, key: str) -> None:
+        self._counters.pop(key, None)
+
+    def clear(self) -> None:
+        self._counters.clear()
+
+
+class SqlRateLimiter(RateLimiter):
+    """Limiter backed by the rate_limits table, shared across workers."""
+
+    def __init__(
+        self, *args, purge_interval: float = RATE_LIMIT_PURGE_INTERVAL, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    async def count(self, key: str) -> int:
+        slot = self._slot(time.time())
+        return await count_rate_limit_hits_db(self._key(key), slot - self.buckets)
+
+    def _purge_due(self, now: float) -> bool:
+        if now < self._next_purge:
+            return False
+        self._next_purge = now + self.purge_interval
+        return True
+
+    def _expires_at(self, slot: int) -> float:
+        return (slot + self.buckets + 1) * self.slot_width
+
+    async def add(self, key: str) -> None:
+        now = time.time()
+        if self._purge_due(now):
+            await purge_rate_limits_db(now)
+        slot = self._slot(now)
+        await add_rate_limit_hit_db(self._key(key), slot, self._expires_at(slot))
+
+    def _hit(self, key: str, now: float) -> tuple:
+        """Arguments of acquire_rate_limit_hits_db for a hit on key at now."""
+        slot = self._slot(now)
+        return (
+            self._key(key),
+            slot,
+            slot - self.buckets,
+            self._expires_at(slot),
+            self.limit,
+        )
+
+    async def acquire(self, key: str) -> bool:
+        # A separate count and add would let concurrent workers all pass the
+        # check before any of them records its hit.
+        return await acquire_all([(self, key)]) is None
+
+    async def reset(self, key: str) -> None:
+        await delete_rate_limit_db(self._key(key))
+
+
+def create_limiter(name: str, limit: int, window: float) -> RateLimiter:
+    """Build a limiter on the backend selected by RATE_LIMIT_BACKEND."""
+    if RATE_LIMIT_BACKEND == "sql":
+        return SqlRateLimiter(name, limit, window)
+    if RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimiter(name, limit, window)
+    raise ValueError(f"unknown RATE_LIMIT_BACKEND: {RATE_LIMIT_BACKEND!r}")
+
+
+async def acquire_all(hits: Sequence[Tuple[RateLimiter, str]]) -> Optional[int]:
+    """
+    Acquire (limiter, key) hits in order until one is refused; return its index.
+
+    Consecutive hits on SqlRateLimiters share one connection and transaction
+    instead of taking one each.
+    """
+    index = 0
+    while index < len(hits):
+        limiter, key = hits[index]
+        if not isinstance(limiter, SqlRateLimiter):
+            if not await limiter.acquire(key):
+                return index
+            index += 1
+            continue
+        end = index
+        while end < len(hits) and isinstance(hits[end][0], SqlRateLimiter):
+            end += 1
+        now = time.time()
+        batch = hits[index:end]
+        # Every limiter shares the table, so one purge serves them all.
+        purge = [sql._purge_due(now) for sql, _ in batch]
+        rejected = await acquire_rate_limit_hits_db(
+            [sql._hit(sql_key, now) for sql, sql_key in batch],
+            purge_before=now if any(purge) else None,
+        )
+        if rejected is not None:
+            return index + rejected
+        index = end
+    return None
+
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing the per-IP, per-user and global request limits.
+
+    ``limits`` maps "ip", "user" and "global" to limiters and is read on every
+    request; a limiter whose limit is 0 is off. ``resolve_token`` returns the
+    token data of a bearer token, which is kept in the request state so the
+    endpoint does not look it up again.
+    """
+
+    MESSAGES = {
+        "ip": "Too many requests from this IP address",
+        "user": "Too many requests for this user",
+        "global": "Service is handling too many requests",
+    }
+
+    def __init__(
+        self,
+        app,
+        limits: Mapping[str, RateLimiter],
+        resolve_token: Callable[[str], Awaitable[Optional[dict]]],
+        exempt_paths: Tuple[str, ...] = ("/health", "/metrics"),
+    ):
+        self.app = app
+        self.limits = limits
+        self.resolve_token = resolve_token
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+        rejected = await self._check(scope)
+        if rejected is not None:
+            await self._too_many_requests(send, self.MESSAGES[rejected])
+            return
+        await self.app(scope, receive, send)
+
+    async def _user_id(self, scope) -> Optional[str]:
+        authorization = (_header(scope["headers"], b"authorization") or b"").decode(
+            "latin-1"
+        )
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        token_data = await self.resolve_token(token)
+        scope.setdefault("state", {})["token_data"] = token_data
+        if token_data and token_data["expires_at"] > time.time():
+            return str(token_data["user_id"])
+        return None
+
+    async def _check(self, scope) -> Optional[str]:
+        """Name of the first limit the request exceeds, None when within all."""
+        client = scope.get("client")
+        keys = {"ip": client[0] if client else "unknown"}
+        if self.limits["user"].limit:
+            user_id = await self._user_id(scope)
+            if user_id is not None:
+                keys["user"] = user_id
+        # The global key would be a single hot row shared by every request in
+        # the SQL backend, so callers keep that limiter process-local.
+        keys["global"] = "*"
+        names = [name for name in keys if self.limits[name].limit]
+        rejected = await acquire_all([(self.limits[n], keys[n]) for n in names])
+        return None if rejected is None else names[rejected]
+
+    @staticmethod
+    async def _too_many_requests(send, message: str) -> None:
+        body = json.dumps(
+            {"error": {"code": "too_many_requests", "message": message}}
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", b"1"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
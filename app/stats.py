@@ -0,0 +1,76 @@
+"""
+Suggestion statistics.
+
+Triggers on the suggestions table keep ``suggestion_counts`` up to date in the
+same transaction as every insert, update and delete, so GET /suggestions/stats
+reads at most one row per status however many suggestions there are.
+
+Counters can still drift when rows are changed with the triggers bypassed
+(a restored dump, manual maintenance). ``CountReconciler`` recounts the table
+every STATS_RECONCILE_INTERVAL seconds from a background task each worker
+starts, and reports the corrected difference in ``suggestion_counts_drift``.
+The recount compares the table with the counters in one snapshot and applies
+the difference as deltas, so it never blocks writers. On Postgres it runs under
+an advisory lock that instances only try to take, so when several come due
+together one of them recounts and the others skip their turn.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from .database import reconcile_suggestion_counts_db
+from .metrics import registry
+
+STATS_RECONCILE_INTERVAL = float(os.getenv("STATS_RECONCILE_INTERVAL", "3600"))
+
+logger = logging.getLogger(__name__)
+
+count_drift = registry.counter(
+    "suggestion_counts_drift",
+    "Difference between the suggestion counters and a recount, as corrected.",
+)
+
+
+class CountReconciler:
+    """Recounts the suggestion counters once per interval in the background."""
+
+    def __init__(self, interval: float = STATS_RECONCILE_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self) -> Optional[int]:
+        """Recount now; returns the drift corrected, None if another instance is."""
+        drift = await reconcile_suggestion_counts_db()
+        if drift is None:
+            logger.debug("suggestion counters are being recounted elsewhere")
+        elif drift:
+            count_drift.inc(amount=drift)
+            logger.warning("suggestion counters were off by %d, corrected", drift)
+        return drift
+
+    async def _loop(self) -> None:
+        # The bootstrap counts from scratch whenever it creates the counters,
+        # so the first recount waits a full interval.
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run()
+            except Exception:
+                logger.exception("suggestion counter reconciliation failed")
+
+    def start(self) -> None:
+        """Start the periodic recount on the running loop, unless already started."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,309 @@
+"""
+Access tokens: issuing them and storing them with expiry.
+
+A ``TokenIssuer`` creates tokens and resolves them back to a user; it keeps
+whatever it needs to remember in a ``TokenStore``.
+
+``MemoryTokenStore`` keeps tokens in a dict plus a min-heap ordered by expiry,
+so expired entries are evicted in amortised O(log n) instead of scanning every
+token. ``SqlTokenStore`` keeps them in the ``tokens`` table so sessions survive
+restarts and are shared between workers.
+
+``OpaqueTokenIssuer`` hands out random ids and stores every one of them.
+``JwtTokenIssuer`` issues stateless HMAC-SHA256 JWTs instead: validation is pure
+CPU work (with an LRU of decoded claims) and only revoked ``jti`` values are
+stored, until the token would have expired anyway.
+"""
+
+import base64
+import binascii
+import hashlib
+import heapq
+import hmac
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional
+from uuid import uuid4
+
+from .database import (
+    create_token_db,
+    delete_expired_tokens_db,
+    delete_token_db,
+    delete_tokens_db,
+    get_token_db,
+)
+
+TOKEN_STORE = os.getenv("TOKEN_STORE", "memory")
+TOKEN_FORMAT = os.getenv("TOKEN_FORMAT", "opaque")
+TOKEN_PURGE_INTERVAL = float(os.getenv("TOKEN_PURGE_INTERVAL", "60"))
+JWT_SECRET = os.getenv("JWT_SECRET", "")
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+JWT_MAX_LENGTH = 4096
+
+
+class TokenStore(ABC):
+    """Interface shared by token storage backends."""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def put(self, token: str, user_id: int, created_at: float) -> None:
+        """Store a token issued at created_at."""
+
+    @abstractmethod
+    async def get(self, token: str) -> Optional[dict]:
+        """
+        Return {"user_id", "created_at", "expires_at"} for a stored token.
+
+        Expired tokens are still returned until the backend evicts them, so
+        callers can tell an expired token from an unknown one.
+        """
+
+    @abstractmethod
+    async def delete(self, token: str) -> None:
+        """Forget a token."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Forget every token."""
+
+
+class MemoryTokenStore(TokenStore):
+    """Process-local store with a heap-based expiry index."""
+
+    def __init__(self, ttl: int):
+        super().__init__(ttl)
+        self._tokens: dict[str, dict] = {}
+        self._expiry: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def _evict_expired(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            _, token = heapq.heappop(self._expiry)
+            self._tokens.pop(token, None)
+
+    async def put(self, token: str, user_id: int, created_at: float) -> None:
+        self._evict_expired(time.time())
+        expires_at = created_at + self.ttl
+        self._tokens[token] = {
+            "user_id": user_id,
+            "created_at": created_at,
+            "expires_at": expires_at,
+        }
+        heapq.heappush(self._expiry, (expires_at, token))
+
+    async def get(self, token: str) -> Optional[dict]:
+        # Looked up before eviction so that an expired token is reported once.
+        entry = self._tokens.get(token)
+        self._evict_expired(time.time())
+        return entry
+
+    async def delete(self, token: str) -> None:
+        # The heap entry stays behind and is discarded when it expires.
+        self._tokens.pop(token, None)
+
+    async def clear(self) -> None:
+        self._tokens.clear()
+        self._expiry.clear()
+
+
+class SqlTokenStore(TokenStore):
+    """Store backed by the tokens table, shared across workers."""
+
+    def __init__(self, ttl: int, purge_interval: float = TOKEN_PURGE_INTERVAL):
+        super().__init__(ttl)
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    async def _maybe_purge(self, now: float) -> None:
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            await delete_expired_tokens_db(now)
+
+    async def put(self, token: str, user_id: int, created_at: float) -> None:
+        await self._maybe_purge(time.time())
+        await create_token_db(token, user_id, created_at, created_at + self.ttl)
+
+    async def get(self, token: str) -> Optional[dict]:
+        return await get_token_db(token)
+
+    async def delete(self, token: str) -> None:
+        await delete_token_db(token)
+
+    async def clear(self) -> None:
+        await delete_tokens_db()
+
+
+class InvalidTokenError(Exception):
+    """Raised when a JWT is malformed, has a bad signature or is expired."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+_JWT_HEADER = _b64encode(
+    json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode()
+)
+
+
+def encode_jwt(claims: dict, secret: bytes) -> str:
+    """Sign claims as an HS256 JWT."""
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    signing_input = f"{_JWT_HEADER}.{payload}".encode()
+    signature = hmac.new(secret, signing_input, hashlib.sha256).digest()
+    return f"{_JWT_HEADER}.{payload}.{_b64encode(signature)}"
+
+
+def decode_jwt(token: str, secret: bytes) -> dict:
+    """Verify an HS256 JWT signature and return its claims (expiry not checked)."""
+    if len(token) > JWT_MAX_LENGTH or token.count(".") != 2:
+        raise InvalidTokenError("malformed token")
+    header, payload, signature = token.split(".")
+    expected = hmac.new(secret, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    try:
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            raise InvalidTokenError("bad signature")
+        if json.loads(_b64decode(header)).get("alg") != "HS256":
+            raise InvalidTokenError("unsupported algorithm")
+        claims = json.loads(_b64decode(payload))
+    except (binascii.Error, UnicodeDecodeError, ValueError, AttributeError) as exc:
+        raise InvalidTokenError("malformed token") from exc
+    if not isinstance(claims, dict) or not all(
+        key in claims for key in ("sub", "exp", "iat", "jti")
+    ):
+        raise InvalidTokenError("missing claims")
+    return claims
+
+
+class TokenIssuer(ABC):
+    """Issues access tokens and resolves them back to their user."""
+
+    def __init__(self, ttl: int, store: TokenStore):
+        self.ttl = ttl
+        self.store = store
+
+    @abstractmethod
+    async def issue(self, user_id: int) -> str:
+        """Create a new token for the user."""
+
+    @abstractmethod
+    async def get(self, token: str) -> Optional[dict]:
+        """
+        Return {"user_id", "created_at", "expires_at"} for a genuine token.
+
+        None for unknown, forged or revoked tokens; expired tokens are returned
+        (while still known) so callers can report them as expired.
+        """
+
+    @abstractmethod
+    async def revoke(self, token: str) -> None:
+        """Make a token unusable before it expires."""
+
+    async def clear(self) -> None:
+        await self.store.clear()
+
+
+class OpaqueTokenIssuer(TokenIssuer):
+    """Random token ids looked up in the store."""
+
+    async def issue(self, user_id: int) -> str:
+        token = str(uuid4())
+        await self.store.put(token, user_id, time.time())
+        return token
+
+    async def get(self, token: str) -> Optional[dict]:
+        return await self.store.get(token)
+
+    async def revoke(self, token: str) -> None:
+        await self.store.delete(token)
+
+
+class JwtTokenIssuer(TokenIssuer):
+    """Stateless signed tokens; the store only holds revoked jti values."""
+
+    def __init__(
+        self,
+        ttl: int,
+        secret: bytes,
+        revoked: TokenStore,
+        cache_size: int = JWT_CACHE_SIZE,
+    ):
+        super().__init__(ttl, revoked)
+        self.secret = secret
+        self._decode = lru_cache(maxsize=cache_size)(self._decode_uncached)
+
+    def _decode_uncached(self, token: str) -> dict:
+        return decode_jwt(token, self.secret)
+
+    def claims(self, token: str) -> Optional[dict]:
+        """Verified claims of a token (expired or not), or None."""
+        try:
+            return self._decode(token)
+        except InvalidTokenError:
+            return None
+
+    async def issue(self, user_id: int) -> str:
+        now = int(time.time())
+        return encode_jwt(
+            {
+                "sub": str(user_id),
+                "iat": now,
+                "exp": now + self.ttl,
+                "jti": uuid4().hex,
+            },
+            self.secret,
+        )
+
+    async def get(self, token: str) -> Optional[dict]:
+        claims = self.claims(token)
+        if not claims:
+            return None
+        # Revocations are forgotten once the token expires; no lookup needed then.
+        if claims["exp"] > time.time() and await self.store.get(claims["jti"]):
+            return None
+        return {
+            "user_id": int(claims["sub"]),
+            "created_at": claims["iat"],
+            "expires_at": claims["exp"],
+        }
+
+    async def revoke(self, token: str) -> None:
+        claims = self.claims(token)
+        if claims and claims["exp"] > time.time():
+            # Revocations only need to outlive the token itself.
+            await self.store.put(claims["jti"], int(claims["sub"]), claims["iat"])
+
+    async def clear(self) -> None:
+        self._decode.cache_clear()
+        await super().clear()
+
+
+def _create_backend(ttl: int) -> TokenStore:
+    if TOKEN_STORE == "sql":
+        return SqlTokenStore(ttl)
+    if TOKEN_STORE == "memory":
+        return MemoryTokenStore(ttl)
+    raise ValueError(f"unknown TOKEN_STORE: {TOKEN_STORE!r}")
+
+
+def create_token_issuer(ttl: int) -> TokenIssuer:
+    """Build the token issuer selected by TOKEN_FORMAT, stored in TOKEN_STORE."""
+    if TOKEN_FORMAT == "opaque":
+        return OpaqueTokenIssuer(ttl, _create_backend(ttl))
+    if TOKEN_FORMAT == "jwt":
+        if not JWT_SECRET:
+            # A generated secret would make every worker reject the others' tokens.
+            raise RuntimeError("TOKEN_FORMAT=jwt requires JWT_SECRET to be set")
+        return JwtTokenIssuer(ttl, JWT_SECRET.encode(), revoked=_create_backend(ttl))
+    raise ValueError(f"unknown TOKEN_FORMAT: {TOKEN_FORMAT!r}")
@@ -0,0 +1,145 @@
+"""
+Group commit for suggestion creation (WRITE_BEHIND=true).
+
+Instead of one connection, INSERT and commit per request, creates are collected
+into a batch for at most WRITE_BEHIND_MAX_DELAY_MS (or until
+WRITE_BEHIND_MAX_BATCH rows) and written by one multi-row INSERT ... RETURNING
+in a single transaction. Every request waits for its batch and gets its own row
+back, so the response is only sent once the row is committed; a failed flush
+fails every request of the batch.
+
+At most WRITE_BEHIND_QUEUE_SIZE rows wait or are being written at a time;
+beyond that requests are rejected with WriteQueueFullError (503) right away
+rather than queueing without bound.
+"""
+
+import asyncio
+import os
+import time
+from typing import List, Optional, Set
+
+from .database import create_suggestions_db
+from .metrics import registry
+
+WRITE_BEHIND = os.getenv("WRITE_BEHIND", "false").lower() == "true"
+WRITE_BEHIND_MAX_DELAY_MS = float(os.getenv("WRITE_BEHIND_MAX_DELAY_MS", "5"))
+WRITE_BEHIND_MAX_BATCH = int(os.getenv("WRITE_BEHIND_MAX_BATCH", "500"))
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "5000"))
+
+write_flushes = registry.histogram(
+    "write_behind_flush_seconds",
+    "Time to write one batch of suggestions, by outcome.",
+    labels=("outcome",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+write_batch_sizes = registry.histogram(
+    "write_behind_batch_size",
+    "Suggestions written per batch.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+write_waits = registry.histogram(
+    "write_behind_wait_seconds",
+    "Time from enqueueing a suggestion to its commit.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+write_rejections = registry.counter(
+    "write_behind_rejected", "Suggestions rejected because the queue was full."
+)
+
+
+class WriteQueueFullError(Exception):
+    """Raised when WRITE_BEHIND_QUEUE_SIZE rows are already waiting."""
+
+
+class _Batch:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.items: List[dict] = []
+        self.futures: List[asyncio.Future] = []
+        self.full = asyncio.Event()
+
+
+class SuggestionWriter:
+    """Collects suggestion inserts into batches flushed by a task per batch."""
+
+    def __init__(self, max_batch: int, max_delay: float, queue_size: int):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue_size = queue_size
+        self._batch: Optional[_Batch] = None
+        self._queued = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def queued(self) -> int:
+        """Rows waiting for a flush or being written."""
+        return self._queued
+
+    async def create(self, user_id: int, title: str, text: str, status: str) -> dict:
+        """Queue one suggestion and return its row once the batch is committed."""
+        if self._queued >= self.queue_size:
+            write_rejections.inc()
+            raise WriteQueueFullError("suggestion write queue is full")
+
+        loop = asyncio.get_running_loop()
+        batch = self._batch
+        if batch is None or batch.loop is not loop:
+            batch = self._batch = _Batch(loop)
+            # A task of its own, so the batch is flushed even if the request that
+            # opened it is cancelled.
+            task = loop.create_task(self._flush_after_delay(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        future = loop.create_future()
+        batch.items.append(
+            {"user_id": user_id, "title": title, "text": text, "status": status}
+        )
+        batch.futures.append(future)
+        self._queued += 1
+        if len(batch.items) >= self.max_batch:
+            self._batch = None
+            batch.full.set()
+
+        enqueued_at = time.perf_counter()
+        row = await asyncio.shield(future)
+        write_waits.observe(time.perf_counter() - enqueued_at)
+        return row
+
+    async def _flush_after_delay(self, batch: _Batch) -> None:
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.max_delay)
+        except asyncio.TimeoutError:
+            pass
+        if self._batch is batch:
+            self._batch = None
+
+        started = time.perf_counter()
+        try:
+            rows = await create_suggestions_db(batch.items)
+        except Exception as exc:
+            write_flushes.observe(time.perf_counter() - started, "error")
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            write_flushes.observe(time.perf_counter() - started, "ok")
+            for future, row in zip(batch.futures, rows):
+                if not future.done():
+                    future.set_result(row)
+        finally:
+            write_batch_sizes.observe(len(batch.items))
+            self._queued -= len(batch.items)
+
+
+suggestion_writer = SuggestionWriter(
+    max_batch=WRITE_BEHIND_MAX_BATCH,
+    max_delay=WRITE_BEHIND_MAX_DELAY_MS / 1000,
+    queue_size=WRITE_BEHIND_QUEUE_SIZE,
+)
+
+registry.gauge(
+    "write_behind_queue_depth",
+    "Suggestions waiting for or in a batch write.",
+    callback=lambda: suggestion_writer.queued,
+)
@@ -0,0 +1,11 @@
+"""Helpers shared by the benchmarks."""
+
+import math
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of already sorted values."""
+    if not values:
+        return float("nan")
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
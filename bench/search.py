@@ -0,0 +1,85 @@
+"""
+Full-text search latency benchmark.
+
+Seeds the database from DATABASE_URL with synthetic suggestions and times
+search_suggestions_db for a mix of common, rare and multi-word queries:
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.search --rows 1000000
+    DATABASE_URL=postgresql://... python -m bench.search --rows 1000000
+
+Seeding is skipped when the table already holds enough rows.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import func, select
+
+from app.database import engine, init_db, search_suggestions_db, suggestions_table
+from bench.common import percentile
+
+WORDS = [f"w{i}" for i in range(5000)]
+QUERIES = ["w1", "w42", "w3000", "w7 w8", "w100 w200 w300"]
+SEED_BATCH = 10000
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    # Zipf-like skew: low word numbers are common, high ones rare.
+    return " ".join(
+        WORDS[min(int(rng.paretovariate(1.1)), len(WORDS)) - 1] for _ in range(words)
+    )
+
+
+async def seed(rows: int) -> None:
+    await init_db()
+    async with engine.connect() as conn:
+        existing = await conn.scalar(
+            select(func.count()).select_from(suggestions_table)
+        )
+    rng = random.Random(0)
+    for start in range(existing, rows, SEED_BATCH):
+        batch = [
+            {
+                "user_id": rng.randint(1, 1000),
+                "title": _sentence(rng, 6),
+                "text": _sentence(rng, 40),
+                "status": rng.choice(["new", "reviewing", "approved", "rejected"]),
+            }
+            for _ in range(min(SEED_BATCH, rows - start))
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(suggestions_table.insert(), batch)
+        print(f"seeded {start + len(batch)}/{rows}", end="\r", flush=True)
+    print()
+
+
+async def run(rows: int, repeat: int, limit: int) -> None:
+    await seed(rows)
+    print(f"{'query':<16}{'hits':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = await search_suggestions_db(query, limit=limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(
+            f"{query:<16}{len(hits):>6}{percentile(timings, 50):>10.1f}"
+            f"{percentile(timings, 95):>10.1f}{timings[-1]:>10.1f}"
+        )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Response serialisation benchmark for suggestion lists.
+
+Encodes the same page of synthetic suggestion rows the way FastAPI does for
+``response_model=List[SuggestionOut]`` (validation, jsonable_encoder, json) and
+through the FAST_JSON path, and reports the time per page:
+
+    python -m bench.serialization --rows 10000
+
+No database is needed; rows have the shape get_suggestions_db returns.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.main import app
+from app.serialization import encode_suggestions
+from bench.common import percentile
+
+WORDS = ["parking", "canteen", "library", "wifi", "bike", "coffee", "lamp", "gym"]
+STATUSES = ["new", "reviewing", "approved", "rejected"]
+
+
+def make_rows(count: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "user_id": rng.randint(1, 1000),
+            "title": " ".join(rng.choice(WORDS) for _ in range(4)),
+            "text": " ".join(rng.choice(WORDS) for _ in range(60)),
+            "status": rng.choice(STATUSES),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def fastapi_encoder() -> Callable[[List[dict]], bytes]:
+    """Serialise like the GET /suggestions route with FAST_JSON off."""
+    (route,) = [
+        r
+        for r in app.routes
+        if getattr(r, "path", None) == "/suggestions" and "GET" in r.methods
+    ]
+
+    def encode(rows: List[dict]) -> bytes:
+        content = asyncio.run(
+            serialize_response(
+                field=route.response_field, response_content=rows, is_coroutine=True
+            )
+        )
+        return JSONResponse(content).body
+
+    return encode
+
+
+def run(rows: int, repeat: int) -> Dict[str, dict]:
+    page = make_rows(rows)
+    paths = {"response_model": fastapi_encoder(), "fast_json": encode_suggestions}
+    report = {}
+    for name, encode in paths.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = encode(page)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        report[name] = {
+            "bytes": len(body),
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    report = run(args.rows, args.repeat)
+    print(f"{'path':<16}{'bytes':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, row in report.items():
+        print(
+            f"{name:<16}{row['bytes']:>10}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+        )
+    base, fast = report["response_model"]["p50_ms"], report["fast_json"]["p50_ms"]
+    print(f"speedup: {base / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
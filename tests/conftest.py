@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -15,20 +16,53 @@ from app.database import engine, metadata  # noqa: E402
 from app.main import app  # noqa: E402
 
 
+async def _run_sync(fn):
+    async with engine.begin() as conn:
+        await conn.run_sync(fn)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def dispose_engine():
+    yield
+    # aiosqlite keeps a non-daemon worker thread per connection.
+    asyncio.run(engine.dispose())
+
+
 @pytest.fixture(scope="function")
 def test_db():
-    metadata.create_all(bind=engine)
+    asyncio.run(_run_sync(metadata.create_all))
+    yield engine
+    asyncio.run(_run_sync(metadata.drop_all))
+
+
+@pytest.fixture
+def empty_db():
+    """A database without any tables, for schema bootstrap and migrations."""
+    asyncio.run(_run_sync(metadata.drop_all))
     yield engine
-    metadata.drop_all(bind=engine)
+    asyncio.run(_run_sync(metadata.drop_all))
 
 
 @pytest.fixture(scope="function")
 def client(test_db):
-    from app.main import _RATE_LIMIT, _RATE_LIMIT_IP, _TOKENS
+    from app.cache import suggestion_cache
+    from app.main import (
+        _ITEMS,
+        _RATE_LIMIT,
+        _RATE_LIMIT_IP,
+        _READINESS,
+        _REQUEST_LIMITS,
+        _TOKENS,
+    )
 
-    _TOKENS.clear()
+    suggestion_cache.clear()
+    _READINESS.clear()
+    asyncio.run(_TOKENS.clear())
+    _ITEMS.clear()
     _RATE_LIMIT.clear()
     _RATE_LIMIT_IP.clear()
+    for limiter in _REQUEST_LIMITS.values():
+        limiter.clear()
 
     return TestClient(app)
 
@@ -50,3 +84,25 @@ def auth_headers(client):
         return {"Authorization": f"Bearer {token}"}
 
     return _auth_headers
+
+
+@pytest.fixture
+def create_suggestion(client):
+    def _create_suggestion(headers, title="Title", text="Text", status="new"):
+        response = client.post(
+            "/suggestions",
+            headers=headers,
+            json={"title": title, "text": text, "status": status},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    return _create_suggestion
+
+
+@pytest.fixture
+def profile_header(monkeypatch):
+    """Report per-request database usage in the X-DB-Profile header."""
+    from app import profiling
+
+    monkeypatch.setattr(profiling, "DB_PROFILE_HEADER", True)
@@ -6,8 +6,31 @@ Tests cover:
 - Users can only delete their own suggestions
 - Users can read all suggestions
 - Proper error messages for unauthorized access
+- Ownership is checked by the write statement itself
 """
 
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.database import engine
+
+
+@contextmanager
+def _suggestion_statements():
+    """Collect SQL statements that touch the suggestions table."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if "suggestions" in statement and "suggestion_versions" not in statement:
+            statements.append(statement.split()[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
 
 class TestOwnerOnlyAuthorization:
     """Test that users can only modify their own suggestions."""
@@ -234,3 +257,52 @@ class TestOwnerOnlyAuthorization:
 
         assert response1.json()["id"] != response2.json()["id"]
         assert response1.json()["user_id"] != response2.json()["user_id"]
+
+
+class TestConditionalWrites:
+    """Test that owner checks do not need a separate read."""
+
+    def test_owner_update_is_single_statement(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that an owner's update runs one UPDATE and no SELECT."""
+        headers = auth_headers("owner", "pass12345")
+        suggestion_id = create_suggestion(headers, "Mine")["id"]
+
+        with _suggestion_statements() as statements:
+            response = client.put(
+                f"/suggestions/{suggestion_id}",
+                headers=headers,
+                json={"title": "Changed", "text": "Text"},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "new"
+        assert statements == ["UPDATE"]
+
+    def test_owner_delete_is_single_statement(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that an owner's delete runs one DELETE and no SELECT."""
+        headers = auth_headers("owner", "pass12345")
+        suggestion_id = create_suggestion(headers, "Mine")["id"]
+
+        with _suggestion_statements() as statements:
+            response = client.delete(f"/suggestions/{suggestion_id}", headers=headers)
+
+        assert response.status_code == 200
+        assert statements == ["DELETE"]
+
+    def test_miss_probes_existence(self, client, auth_headers, create_suggestion):
+        """Test that a miss tells forbidden from not found with one probe."""
+        owner = auth_headers("owner", "pass12345")
+        other = auth_headers("other", "pass12345")
+        suggestion_id = create_suggestion(owner, "Mine")["id"]
+
+        with _suggestion_statements() as statements:
+            forbidden = client.delete(f"/suggestions/{suggestion_id}", headers=other)
+        missing = client.delete("/suggestions/99999", headers=other)
+
+        assert forbidden.status_code == 403
+        assert missing.status_code == 404
+        assert statements == ["DELETE", "SELECT"]
@@ -0,0 +1,209 @@
+"""
+Tests for bulk suggestion endpoints.
+
+Tests cover:
+- POST /suggestions:batch creates, updates and deletes in one request
+- Per-item results for foreign and missing ids, including rows deleted meanwhile
+- Updates without a status keep the current status
+- PATCH /suggestions/status moves many suggestions at once
+- Batch writes invalidate cached reads
+- Batch size limits, duplicate update ids and authentication
+"""
+
+
+def _titles(client, **params):
+    return [s["title"] for s in client.get("/suggestions", params=params).json()]
+
+
+class TestBatch:
+    """Test the mixed create/update/delete endpoint."""
+
+    def test_mixed_batch(self, client, auth_headers, create_suggestion):
+        """Test that all operations of a batch are applied and reported."""
+        headers = auth_headers()
+        keep = create_suggestion(headers, "Keep")
+        doomed = create_suggestion(headers, "Doomed")
+
+        response = client.post(
+            "/suggestions:batch",
+            headers=headers,
+            json={
+                "create": [
+                    {"title": "One", "text": "Text"},
+                    {"title": "Two", "text": "Text", "status": "approved"},
+                ],
+                "update": [
+                    {"id": keep["id"], "title": "Kept", "text": "Changed"},
+                ],
+                "delete": [doomed["id"]],
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [(r["op"], r["result"]) for r in results] == [
+            ("create", "created"),
+            ("create", "created"),
+            ("update", "updated"),
+            ("delete", "deleted"),
+        ]
+        assert results[0]["id"] < results[1]["id"]
+        assert _titles(client, status="new") == ["Kept", "One"]
+        assert _titles(client, status="approved") == ["Two"]
+
+    def test_foreign_and_missing_ids(self, client, auth_headers, create_suggestion):
+        """Test that only owned suggestions are touched."""
+        owner = auth_headers()
+        other = auth_headers("other", "pass12345")
+        foreign = create_suggestion(other, "Foreign")
+
+        response = client.post(
+            "/suggestions:batch",
+            headers=owner,
+            json={
+                "update": [{"id": foreign["id"], "title": "Hijack", "text": "Text"}],
+                "delete": [foreign["id"], 99999],
+            },
+        )
+
+        results = response.json()["results"]
+        assert [r["result"] for r in results] == ["forbidden", "forbidden", "not_found"]
+        assert client.get(f"/suggestions/{foreign['id']}").json()["title"] == "Foreign"
+
+    def test_update_invalidates_cache(self, client, auth_headers, create_suggestion):
+        """Test that cached suggestions are dropped after a batch update."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers, "Before")
+        client.get(f"/suggestions/{suggestion['id']}")
+
+        client.post(
+            "/suggestions:batch",
+            headers=headers,
+            json={"update": [{"id": suggestion["id"], "title": "After", "text": "T"}]},
+        )
+
+        assert client.get(f"/suggestions/{suggestion['id']}").json()["title"] == "After"
+
+    def test_update_without_status_keeps_it(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that an update item without status leaves the status alone."""
+        headers = auth_headers()
+        kept = create_suggestion(headers, "Kept", status="approved")
+        moved = create_suggestion(headers, "Moved")
+
+        client.post(
+            "/suggestions:batch",
+            headers=headers,
+            json={
+                "update": [
+                    {"id": kept["id"], "title": "Renamed", "text": "Text"},
+                    {
+                        "id": moved["id"],
+                        "title": "Moved",
+                        "text": "Text",
+                        "status": "rejected",
+                    },
+                ]
+            },
+        )
+
+        renamed = client.get(f"/suggestions/{kept['id']}").json()
+        assert (renamed["title"], renamed["status"]) == ("Renamed", "approved")
+        assert client.get(f"/suggestions/{moved['id']}").json()["status"] == "rejected"
+
+    def test_update_of_concurrently_deleted_row(
+        self, client, auth_headers, create_suggestion, monkeypatch
+    ):
+        """Test that rows gone since the ownership check are not reported updated."""
+        headers = auth_headers()
+        gone = create_suggestion(headers, "Gone")
+        client.delete(f"/suggestions/{gone['id']}", headers=headers)
+
+        async def stale_owners(conn, ids):
+            return {gone["id"]: gone["user_id"]}
+
+        monkeypatch.setattr("app.database._owners", stale_owners)
+        response = client.post(
+            "/suggestions:batch",
+            headers=headers,
+            json={"update": [{"id": gone["id"], "title": "Back", "text": "Text"}]},
+        )
+
+        assert response.json()["results"] == [
+            {"op": "update", "id": gone["id"], "result": "not_found"}
+        ]
+
+    def test_batch_size_limit(self, client, auth_headers):
+        """Test that oversized batches are rejected."""
+        response = client.post(
+            "/suggestions:batch",
+            headers=auth_headers(),
+            json={"delete": list(range(1, 502))},
+        )
+        assert response.status_code == 422
+
+    def test_duplicate_update_ids(self, client, auth_headers, create_suggestion):
+        """Test that a batch updating one id twice is rejected and changes nothing."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers, "Original")
+        response = client.post(
+            "/suggestions:batch",
+            headers=headers,
+            json={
+                "update": [
+                    {"id": suggestion["id"], "title": "A", "text": "Text"},
+                    {"id": suggestion["id"], "title": "B", "text": "Text"},
+                ]
+            },
+        )
+        assert response.status_code == 422
+        assert _titles(client) == ["Original"]
+
+    def test_requires_auth(self, client):
+        """Test that batches need a token."""
+        response = client.post("/suggestions:batch", json={"delete": [1]})
+        assert response.status_code in (401, 403)
+
+
+class TestStatusUpdate:
+    """Test the bulk status endpoint."""
+
+    def test_moves_owned_suggestions(self, client, auth_headers, create_suggestion):
+        """Test that owned suggestions change status and others are reported."""
+        headers = auth_headers()
+        other = auth_headers("other", "pass12345")
+        first = create_suggestion(headers, "First")
+        second = create_suggestion(headers, "Second")
+        foreign = create_suggestion(other, "Foreign")
+        client.get(f"/suggestions/{first['id']}")
+
+        response = client.patch(
+            "/suggestions/status",
+            headers=headers,
+            json={
+                "ids": [first["id"], second["id"], foreign["id"], 99999],
+                "status": "reviewing",
+            },
+        )
+
+        assert response.status_code == 200
+        assert [r["result"] for r in response.json()["results"]] == [
+            "updated",
+            "updated",
+            "forbidden",
+            "not_found",
+        ]
+        assert _titles(client, status="reviewing") == ["First", "Second"]
+        assert _titles(client, status="new") == ["Foreign"]
+        cached = client.get(f"/suggestions/{first['id']}").json()
+        assert cached["status"] == "reviewing"
+
+    def test_invalid_status(self, client, auth_headers):
+        """Test that unknown statuses are rejected."""
+        response = client.patch(
+            "/suggestions/status",
+            headers=auth_headers(),
+            json={"ids": [1], "status": "bogus"},
+        )
+        assert response.status_code == 422
@@ -0,0 +1,57 @@
+"""
+Tests for the load benchmark harness.
+
+Tests cover:
+- Nearest-rank percentiles
+- NFR threshold and error budget checks
+- A short run against the test database reports every route
+"""
+
+import asyncio
+
+from bench.common import percentile
+from bench.load import SCENARIOS, Scenario, check, run
+
+
+def _row(route="GET /suggestions", p95=10.0, limit=200, requests=100, errors=0):
+    return {
+        "route": route,
+        "requests": requests,
+        "errors": errors,
+        "p95_ms": p95,
+        "p95_limit_ms": limit,
+    }
+
+
+def test_percentile():
+    """Test nearest-rank percentiles on sorted samples."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_check_flags_regressions():
+    """Test that slow routes and failing routes are reported."""
+    assert check([_row(), _row(limit=None, p95=10_000)]) == []
+
+    failures = check([_row(p95=201), _row(route="POST /suggestions", errors=2)])
+
+    assert failures == [
+        "GET /suggestions: p95 201.0 ms > 200 ms",
+        "POST /suggestions: 2/100 requests failed",
+    ]
+
+
+def test_short_run(client):
+    """Test a short run of every scenario at a low rate."""
+    scenarios = [Scenario(s.route, 2, s.request, s.p95_ms) for s in SCENARIOS]
+
+    report = asyncio.run(run(scenarios, duration=1, users=1, suggestions=5))
+
+    assert [row["route"] for row in report] == [s.route for s in SCENARIOS]
+    for row in report:
+        assert row["requests"] == 2
+        assert row["errors"] == 0
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
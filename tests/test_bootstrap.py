@@ -0,0 +1,64 @@
+"""
+Tests for the bootstrap command and the startup schema check.
+
+Tests cover:
+- Bootstrap creates the schema and missing users, and is idempotent
+- A fresh schema is stamped with the current version
+- Startup refuses an outdated schema and records startup timings
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.bootstrap import bootstrap
+from app.database import (
+    SCHEMA_VERSION,
+    engine,
+    get_schema_version_db,
+    schema_version_table,
+)
+from app.main import app
+
+USERS = [("boot_user", "boot-pass-123")]
+
+
+async def _clear_versions():
+    async with engine.begin() as conn:
+        await conn.execute(schema_version_table.delete())
+
+
+def test_bootstrap_is_idempotent(empty_db):
+    """Test that a second run neither recreates users nor rehashes passwords."""
+    first = asyncio.run(bootstrap(USERS))
+    second = asyncio.run(bootstrap(USERS))
+
+    assert first["previous_version"] == 0
+    assert first["created_users"] == ["boot_user"]
+    assert second["previous_version"] == SCHEMA_VERSION
+    assert second["created_users"] == []
+    assert asyncio.run(get_schema_version_db()) == SCHEMA_VERSION
+
+
+def test_create_all_stamps_version(test_db):
+    """Test that a schema created from metadata records the current version."""
+    assert asyncio.run(get_schema_version_db()) == SCHEMA_VERSION
+
+
+def test_startup_rejects_outdated_schema(test_db):
+    """Test that workers refuse to start before bootstrap has run."""
+    asyncio.run(_clear_versions())
+
+    with pytest.raises(RuntimeError, match="app.bootstrap"):
+        with TestClient(app):
+            pass
+
+
+def test_startup_records_timings(test_db):
+    """Test that a bootstrapped database lets workers start and report timings."""
+    with TestClient(app) as client:
+        text = client.get("/metrics").text
+
+    assert 'app_startup_seconds{phase="startup"}' in text
+    assert 'app_startup_seconds{phase="import"}' in text
@@ -0,0 +1,185 @@
+"""
+Tests for the suggestion read cache.
+
+Tests cover:
+- LRU bound and TTL expiry of the in-memory cache
+- Repeated reads are served from the cache
+- Writes invalidate single suggestions and the affected lists
+- Only the first list page at the default size is cached
+- A row loaded before a concurrent invalidation is not stored
+- Shared Redis backend (when fakeredis is installed)
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.cache import (
+    _MISSING,
+    MemoryCache,
+    RedisCache,
+    SuggestionCache,
+    suggestion_cache,
+)
+
+
+class TestMemoryCache:
+    """Test the bounded in-process cache."""
+
+    def test_lru_bound(self):
+        """Test that the least recently used entries are evicted first."""
+        cache = MemoryCache(max_entries=2, ttl=60)
+        asyncio.run(cache.set("a", 1))
+        asyncio.run(cache.set("b", 2))
+        asyncio.run(cache.get("a"))
+        asyncio.run(cache.set("c", 3))
+
+        assert len(cache) == 2
+        assert asyncio.run(cache.get("b")) is _MISSING
+        assert asyncio.run(cache.get("a")) == 1
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = MemoryCache(max_entries=10, ttl=0.05)
+        asyncio.run(cache.set("a", 1))
+        time.sleep(0.1)
+
+        assert asyncio.run(cache.get("a")) is _MISSING
+        assert cache.stats() == {"hits": 0, "misses": 1, "size": 0}
+
+
+class TestSuggestionCaching:
+    """Test read-through caching and invalidation through the API."""
+
+    def test_repeated_reads_hit_cache(self, client, auth_headers, create_suggestion):
+        """Test that a popular suggestion is loaded from the database once."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers, "Popular")
+        before = client.get("/cache/stats").json()
+
+        for _ in range(3):
+            response = client.get(f"/suggestions/{suggestion['id']}")
+            assert response.json()["title"] == "Popular"
+
+        after = client.get("/cache/stats").json()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 2
+
+    def test_update_invalidates_item_and_lists(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that reads after an update never return the old row."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers, "Before")
+        client.get(f"/suggestions/{suggestion['id']}")
+        client.get("/suggestions", params={"status": "new"})
+
+        client.put(
+            f"/suggestions/{suggestion['id']}",
+            headers=headers,
+            json={"title": "After", "text": "Text", "status": "approved"},
+        )
+
+        assert client.get(f"/suggestions/{suggestion['id']}").json()["title"] == "After"
+        assert client.get("/suggestions", params={"status": "new"}).json() == []
+        approved = client.get("/suggestions", params={"status": "approved"}).json()
+        assert [s["title"] for s in approved] == ["After"]
+
+    def test_create_invalidates_only_matching_lists(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that creating a suggestion keeps other status lists cached."""
+        headers = auth_headers()
+        create_suggestion(headers, "Approved", status="approved")
+        client.get("/suggestions", params={"status": "approved"})
+        client.get("/suggestions", params={"status": "new"})
+
+        create_suggestion(headers, "New one")
+        before = client.get("/cache/stats").json()
+        approved = client.get("/suggestions", params={"status": "approved"}).json()
+        new = client.get("/suggestions", params={"status": "new"}).json()
+        after = client.get("/cache/stats").json()
+
+        assert [s["title"] for s in approved] == ["Approved"]
+        assert [s["title"] for s in new] == ["New one"]
+        assert after["hits"] - before["hits"] == 1
+        assert after["misses"] - before["misses"] == 1
+
+    def test_delete_invalidates_item(self, client, auth_headers, create_suggestion):
+        """Test that a deleted suggestion is not served from the cache."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers, "Doomed")
+        client.get(f"/suggestions/{suggestion['id']}")
+
+        client.delete(f"/suggestions/{suggestion['id']}", headers=headers)
+
+        assert client.get(f"/suggestions/{suggestion['id']}").status_code == 404
+
+    def test_only_first_default_page_is_cached(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that caller-chosen cursors and page sizes bypass the cache."""
+        headers = auth_headers()
+        for n in range(3):
+            create_suggestion(headers, f"Title {n}")
+        first = client.get("/suggestions", params={"limit": 2})
+        cursor = first.headers["X-Next-Cursor"]
+        client.get("/suggestions")
+        sizes = len(suggestion_cache.backend), len(suggestion_cache.bodies)
+
+        for _ in range(2):
+            client.get("/suggestions", params={"limit": 2})
+            client.get("/suggestions", params={"after": cursor})
+
+        assert (len(suggestion_cache.backend), len(suggestion_cache.bodies)) == sizes
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_load_racing_invalidation_is_not_cached(backend):
+    """Test that a row loaded before a write committed is not put back after it."""
+    if backend == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        cache = SuggestionCache(RedisCache(fakeredis.FakeAsyncRedis(), ttl=60))
+    else:
+        cache = SuggestionCache(MemoryCache(max_entries=10, ttl=60))
+    rows = [{"id": 1, "title": "Before", "version": 1}]
+
+    async def stale_load():
+        # The write commits and invalidates while this read holds the old row.
+        old = rows[0]
+        rows[0] = {"id": 1, "title": "After", "version": 2}
+        await cache.changed(1)
+        return old
+
+    async def load():
+        return rows[0]
+
+    async def scenario():
+        first = await cache.get_suggestion(1, stale_load)
+        second = await cache.get_suggestion(1, load)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["title"] == "Before"
+    assert second["title"] == "After"
+
+
+def test_redis_backend():
+    """Test the shared backend against an in-process Redis fake."""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = SuggestionCache(RedisCache(fakeredis.FakeAsyncRedis(), ttl=60))
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return [{"id": 1, "status": "new"}]
+
+    async def scenario():
+        await cache.get_page("new", None, 10, "0.1", load)
+        await cache.get_page("new", None, 10, "0.1", load)
+        await cache.get_page("new", None, 10, "0.2", load)
+
+    asyncio.run(scenario())
+    assert len(loads) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2}
@@ -0,0 +1,191 @@
+"""
+Tests for response compression and compressed cache entries.
+
+Tests cover:
+- Accept-Encoding negotiation
+- Large responses are gzip-compressed, small ones and identity clients are not
+- Cached reads are compressed once and served from the body cache, with
+  FAST_JSON on and off; without it the body matches the response model
+- Updates drop the compressed body of a suggestion
+- Streamed NDJSON is compressed chunk by chunk
+- Bytes values in the Redis backend
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app import main
+from app.cache import _MISSING, RedisCache
+from app.compression import choose_encoding
+
+GZIP = {"Accept-Encoding": "gzip"}
+IDENTITY = {"Accept-Encoding": "identity"}
+LONG_TEXT = "The canteen should open earlier on weekdays. " * 40
+
+
+@pytest.fixture
+def compress_calls(monkeypatch):
+    calls = []
+    original = main.compress
+
+    def counting(body, encoding):
+        calls.append(encoding)
+        return original(body, encoding)
+
+    monkeypatch.setattr(main, "compress", counting)
+    return calls
+
+
+@pytest.fixture(params=[False, True], ids=["response_model", "fast_json"])
+def fast_json(request, monkeypatch):
+    monkeypatch.setattr(main, "FAST_JSON", request.param)
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("gzip;q=0", None),
+            ("deflate, gzip;q=0.5", "gzip"),
+            ("*", "gzip"),
+            ("*;q=0", None),
+        ],
+    )
+    def test_choose_encoding(self, header, expected):
+        """Test picking an encoding from Accept-Encoding."""
+        assert choose_encoding(header) == expected
+
+
+class TestCompression:
+    def test_large_list_is_gzipped(self, client, auth_headers, create_suggestion):
+        """Test that a large list is compressed with the same JSON inside."""
+        headers = auth_headers()
+        for i in range(3):
+            create_suggestion(headers, f"Long {i}", text=LONG_TEXT)
+
+        compressed = client.get("/suggestions", headers=GZIP)
+        plain = client.get("/suggestions", headers=IDENTITY)
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in plain.headers
+        assert compressed.json() == plain.json()
+        assert compressed.headers["etag"] == plain.headers["etag"]
+
+    def test_small_response_is_not_compressed(self, client):
+        """Test that responses under COMPRESSION_MIN_SIZE are sent as is."""
+        response = client.get("/health", headers=GZIP)
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_uncached_routes_are_compressed(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that the middleware compresses responses outside the cache."""
+        headers = {**auth_headers(), **GZIP}
+        create_suggestion(headers, "Long mine", text=LONG_TEXT)
+
+        response = client.get("/suggestions/mine", headers=headers)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()[0]["title"] == "Long mine"
+
+    def test_ndjson_stream_is_compressed(self, client, auth_headers, create_suggestion):
+        """Test that a streamed response is compressed and decodes to every row."""
+        headers = auth_headers()
+        for i in range(3):
+            create_suggestion(headers, f"Streamed {i}", text=LONG_TEXT)
+
+        response = client.get("/suggestions", params={"stream": "true"}, headers=GZIP)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["title"] for r in rows] == ["Streamed 0", "Streamed 1", "Streamed 2"]
+
+
+@pytest.mark.usefixtures("fast_json")
+class TestCompressedCache:
+    def test_page_is_compressed_once(
+        self, client, auth_headers, compress_calls, create_suggestion
+    ):
+        """Test that repeated list reads reuse the cached compressed body."""
+        headers = auth_headers()
+        for i in range(3):
+            create_suggestion(headers, f"Cached {i}", text=LONG_TEXT)
+
+        before = client.get("/cache/stats").json()["bodies"]
+        first = client.get("/suggestions", headers=GZIP)
+        second = client.get("/suggestions", headers=GZIP)
+        after = client.get("/cache/stats").json()["bodies"]
+
+        assert compress_calls == ["gzip"]
+        assert second.content == first.content
+        assert second.headers["content-encoding"] == "gzip"
+        assert after["hits"] - before["hits"] == 1
+
+    def test_update_drops_compressed_body(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that a changed suggestion is not served from a stale body."""
+        headers = auth_headers()
+        created = create_suggestion(headers, "Before", text=LONG_TEXT)
+        path = f"/suggestions/{created['id']}"
+        assert client.get(path, headers=GZIP).json()["title"] == "Before"
+
+        client.put(path, headers=headers, json={"title": "After", "text": LONG_TEXT})
+        response = client.get(path, headers=GZIP)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["title"] == "After"
+
+    def test_small_cached_body_is_not_compressed(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that cached bodies under the size threshold stay uncompressed."""
+        headers = auth_headers()
+        created = create_suggestion(headers, "Short", text="Short text")
+
+        for _ in range(2):
+            response = client.get(f"/suggestions/{created['id']}", headers=GZIP)
+            assert "content-encoding" not in response.headers
+            assert response.json()["title"] == "Short"
+
+
+class TestResponseModelPath:
+    def test_cached_body_matches_response_model(
+        self, client, auth_headers, compress_calls, create_suggestion
+    ):
+        """Test that without FAST_JSON cached bodies are what response_model sends."""
+        headers = auth_headers()
+        created = create_suggestion(headers, "Plain", text=LONG_TEXT)
+        path = f"/suggestions/{created['id']}"
+
+        listed = client.get("/suggestions", headers=GZIP)
+        single = client.get(path, headers=GZIP)
+        client.get(path, headers=GZIP)
+
+        assert compress_calls == ["gzip", "gzip"]
+        assert listed.headers["content-encoding"] == "gzip"
+        assert listed.content == client.get("/suggestions", headers=IDENTITY).content
+        assert single.content == client.get(path, headers=IDENTITY).content
+        assert single.json() == created
+
+
+def test_redis_bytes_values():
+    """Test that bytes values round-trip through the Redis backend."""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = RedisCache(fakeredis.FakeAsyncRedis(), ttl=60)
+
+    async def scenario():
+        await cache.set("body", b"gzip\n\x1f\x8b\x00")
+        await cache.set("rows", [{"id": 1}])
+        return await cache.get("body"), await cache.get("rows"), await cache.get("x")
+
+    assert asyncio.run(scenario()) == (b"gzip\n\x1f\x8b\x00", [{"id": 1}], _MISSING)
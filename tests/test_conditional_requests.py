@@ -0,0 +1,95 @@
+"""
+Tests for HTTP conditional requests on suggestion reads.
+
+Tests cover:
+- ETag on GET /suggestions/{id} follows the row version
+- ETag on GET /suggestions follows the list version
+- If-None-Match answers 304 with an empty body
+- Writes change the validators
+"""
+
+
+class TestSuggestionETag:
+    """Test validators on a single suggestion."""
+
+    def test_not_modified(self, client, auth_headers, create_suggestion):
+        """Test that a matching If-None-Match returns 304."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers)
+
+        first = client.get(f"/suggestions/{suggestion['id']}")
+        etag = first.headers["ETag"]
+        second = client.get(
+            f"/suggestions/{suggestion['id']}", headers={"If-None-Match": etag}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+
+    def test_update_changes_etag(self, client, auth_headers, create_suggestion):
+        """Test that an update bumps the row version and the ETag."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers)
+        etag = client.get(f"/suggestions/{suggestion['id']}").headers["ETag"]
+
+        client.put(
+            f"/suggestions/{suggestion['id']}",
+            headers=headers,
+            json={"title": "Changed", "text": "Text"},
+        )
+        response = client.get(
+            f"/suggestions/{suggestion['id']}", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Changed"
+        assert response.headers["ETag"] != etag
+
+
+class TestListETag:
+    """Test validators on suggestion lists."""
+
+    def test_not_modified_until_write(self, client, auth_headers, create_suggestion):
+        """Test that polling the list gets 304 until a matching write happens."""
+        headers = auth_headers()
+        create_suggestion(headers, "One")
+
+        etag = client.get("/suggestions", params={"status": "new"}).headers["ETag"]
+        polled = client.get(
+            "/suggestions", params={"status": "new"}, headers={"If-None-Match": etag}
+        )
+        assert polled.status_code == 304
+
+        create_suggestion(headers, "Two")
+        changed = client.get(
+            "/suggestions", params={"status": "new"}, headers={"If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert [s["title"] for s in changed.json()] == ["One", "Two"]
+
+    def test_other_status_keeps_etag(self, client, auth_headers, create_suggestion):
+        """Test that writes to one status do not invalidate other lists."""
+        headers = auth_headers()
+        create_suggestion(headers, "Approved", status="approved")
+        etag = client.get("/suggestions", params={"status": "approved"}).headers["ETag"]
+
+        create_suggestion(headers, "New")
+        response = client.get(
+            "/suggestions",
+            params={"status": "approved"},
+            headers={"If-None-Match": f'"other", {etag}'},
+        )
+        assert response.status_code == 304
+
+    def test_delete_changes_etag(self, client, auth_headers, create_suggestion):
+        """Test that deletes invalidate the list validators."""
+        headers = auth_headers()
+        suggestion = create_suggestion(headers)
+        etag = client.get("/suggestions").headers["ETag"]
+
+        client.delete(f"/suggestions/{suggestion['id']}", headers=headers)
+        response = client.get("/suggestions", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json() == []
@@ -0,0 +1,125 @@
+"""
+Tests for the database engine setup.
+
+Tests cover:
+- Pool selection: a real pool for file databases, StaticPool for in-memory SQLite
+- Units of work on file SQLite are isolated: a reader neither sees nor rolls
+  back a concurrent writer's uncommitted rows
+- Concurrent single and batch writes next to reads on file SQLite keep every row
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.pool import StaticPool
+
+from app import database
+from app import main as app_main
+from app.database import (
+    create_engine,
+    create_suggestion_db,
+    get_suggestions_db,
+    metadata,
+    suggestions_table,
+    unit_of_work,
+)
+from app.ratelimit import MemoryRateLimiter
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    """Point the app at a fresh SQLite file with its own pooled engine."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+    asyncio.run(create())
+    monkeypatch.setattr(database, "engine", engine)
+    for name in ("global", "user", "ip"):
+        monkeypatch.setitem(
+            app_main._REQUEST_LIMITS, name, MemoryRateLimiter(f"rps_{name}", 0, 1)
+        )
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+async def _count_committed(url) -> int:
+    """Rows visible to a new connection, i.e. rows that were really committed."""
+    engine = create_engine(url)
+    try:
+        async with engine.connect() as conn:
+            return await conn.scalar(
+                select(func.count()).select_from(suggestions_table)
+            )
+    finally:
+        await engine.dispose()
+
+
+async def _with_concurrent_reads(writes) -> list:
+    """Send every (method, path, json) write and as many list reads at once."""
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        params = {"username": "writer", "password": "pass12345"}
+        await http.post("/auth/register", params=params)
+        token = (await http.post("/auth/login", params=params)).json()
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+        return await asyncio.gather(
+            *(
+                http.request(method, path, headers=headers, json=body)
+                for method, path, body in writes
+            ),
+            *(http.get("/suggestions") for _ in writes),
+        )
+
+
+class TestPool:
+    def test_file_database_is_pooled(self, tmp_path):
+        """Test that connections to a database file are not shared."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+
+        assert not isinstance(engine.pool, StaticPool)
+        assert isinstance(create_engine("sqlite:///:memory:").pool, StaticPool)
+
+
+class TestConcurrentRequests:
+    def test_units_of_work_are_isolated(self, file_db):
+        """Test that a reader closing mid-write does not touch the writer's work."""
+
+        async def scenario():
+            async with unit_of_work() as writer:
+                await create_suggestion_db(1, "Title", "Text", db=writer)
+                async with unit_of_work() as reader:
+                    seen = await get_suggestions_db(db=reader)
+            return seen
+
+        assert asyncio.run(scenario()) == []
+        asyncio.run(file_db.dispose())
+        assert asyncio.run(_count_committed(file_db.url)) == 1
+
+    def test_concurrent_writes_and_reads_keep_rows(self, client, file_db):
+        """Test that reads running next to writes never roll the writes back."""
+        posts = [
+            ("POST", "/suggestions", {"title": f"Title {n}", "text": "Text"})
+            for n in range(30)
+        ]
+
+        responses = asyncio.run(_with_concurrent_reads(posts))
+
+        assert [r.status_code for r in responses] == [200] * 2 * len(posts)
+        asyncio.run(file_db.dispose())
+        assert asyncio.run(_count_committed(file_db.url)) == len(posts)
+
+    def test_concurrent_batches_and_reads_keep_rows(self, client, file_db):
+        """Test that batch writes next to reads are all committed."""
+        batch = {"create": [{"title": "A", "text": "Text"}] * 3}
+        batches = [("POST", "/suggestions:batch", batch)] * 10
+
+        responses = asyncio.run(_with_concurrent_reads(batches))
+
+        assert [r.status_code for r in responses] == [200] * 2 * len(batches)
+        asyncio.run(file_db.dispose())
+        assert asyncio.run(_count_committed(file_db.url)) == 3 * len(batches)
@@ -0,0 +1,156 @@
+"""
+Tests for the bulk suggestion export.
+
+Tests cover:
+- CSV and NDJSON exports stream every row in id order across chunks
+- user_id is masked with a stable keyed hash unless anonymize is off
+- Spreadsheet formulas are neutralised in CSV cells
+- Gzip output decompresses to the plain export
+- The endpoint requires EXPORT_TOKEN and is disabled without it
+- Masking needs a configured EXPORT_MASK_KEY; the app refuses to start
+  with the export enabled and no key
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from app import export, main
+from app.export import export_suggestions, user_masker
+
+TOKEN = "export-secret"
+
+
+@pytest.fixture(autouse=True)
+def mask_key(monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_MASK_KEY", "test-mask-key")
+
+
+def _export(**kwargs) -> bytes:
+    async def collect():
+        return b"".join([chunk async for chunk in export_suggestions(**kwargs)])
+
+    return asyncio.run(collect())
+
+
+@pytest.fixture
+def export_token(monkeypatch):
+    monkeypatch.setattr(main, "EXPORT_TOKEN", TOKEN)
+    return {"Authorization": f"Bearer {TOKEN}"}
+
+
+class TestExport:
+    def test_csv_masks_user_id(self, client, auth_headers, create_suggestion):
+        """Test that CSV rows span chunks and carry a keyed user pseudonym."""
+        alice = auth_headers()
+        bob = auth_headers("other", "pass12345")
+        for i in range(3):
+            create_suggestion(alice, f"Alice {i}")
+            create_suggestion(bob, f"Bob {i}")
+
+        data = _export(fmt="csv", chunk_size=2, mask_key="k")
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+
+        assert [r["title"] for r in rows][:2] == ["Alice 0", "Bob 0"]
+        assert len(rows) == 6
+        users = {r["title"].split()[0]: r["user_id"] for r in rows}
+        assert len(set(users.values())) == 2
+        assert users["Alice"] == user_masker("k")(1)
+        assert user_masker("other key")(1) != users["Alice"]
+
+    def test_ndjson_without_anonymize(self, client, auth_headers, create_suggestion):
+        """Test the raw NDJSON export keeps the real user ids."""
+        headers = auth_headers()
+        created = create_suggestion(headers, "Plain")
+
+        (row,) = [
+            json.loads(line)
+            for line in _export(fmt="ndjson", anonymize=False).splitlines()
+        ]
+
+        assert row["id"] == created["id"]
+        assert row["user_id"] == created["user_id"]
+        assert row["version"] == 1
+
+    def test_csv_formulas_are_neutralised(
+        self, client, auth_headers, create_suggestion
+    ):
+        """Test that cells starting with a formula character are prefixed."""
+        create_suggestion(auth_headers(), '=HYPERLINK("http://x")', "+1 more")
+
+        (row,) = csv.DictReader(io.StringIO(_export(fmt="csv").decode()))
+
+        assert row["title"].startswith("'=")
+        assert row["text"] == "'+1 more"
+
+    def test_gzip_output(self, client, auth_headers, create_suggestion):
+        """Test that the gzip export decompresses to the plain one."""
+        headers = auth_headers()
+        for i in range(5):
+            create_suggestion(headers, f"Zipped {i}")
+
+        plain = _export(fmt="ndjson", chunk_size=2, mask_key="k")
+        zipped = _export(fmt="ndjson", chunk_size=2, mask_key="k", gzip=True)
+
+        assert gzip.decompress(zipped) == plain
+
+
+class TestExportEndpoint:
+    def test_disabled_without_token(self, client):
+        """Test that the export is off unless EXPORT_TOKEN is configured."""
+        response = client.get("/suggestions/export")
+
+        assert response.status_code == 403
+
+    def test_requires_token(self, client, auth_headers, export_token):
+        """Test that user tokens are not accepted for the export."""
+        response = client.get("/suggestions/export", headers=auth_headers())
+
+        assert response.status_code == 401
+        assert response.json()["error"]["code"] == "invalid_token"
+
+    def test_streams_gzip_download(
+        self, client, auth_headers, export_token, create_suggestion
+    ):
+        """Test a gzip NDJSON download through the endpoint."""
+        headers = auth_headers()
+        for i in range(3):
+            create_suggestion(headers, f"Download {i}")
+
+        response = client.get(
+            "/suggestions/export",
+            params={"format": "ndjson", "gzip": "true"},
+            headers=export_token,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert "suggestions.ndjson.gz" in response.headers["content-disposition"]
+        rows = [
+            json.loads(line) for line in gzip.decompress(response.content).splitlines()
+        ]
+        assert [r["title"] for r in rows] == ["Download 0", "Download 1", "Download 2"]
+        assert all(isinstance(r["user_id"], str) for r in rows)
+
+
+class TestMaskKey:
+    def test_masking_requires_key(self, monkeypatch):
+        """Test that user ids are never masked under an unconfigured key."""
+        monkeypatch.setattr(export, "EXPORT_MASK_KEY", "")
+
+        with pytest.raises(ValueError, match="EXPORT_MASK_KEY"):
+            _export(fmt="csv")
+        with pytest.raises(ValueError):
+            user_masker("")
+
+    def test_startup_fails_without_key(self, test_db, monkeypatch):
+        """Test that the app does not start with the export on and no mask key."""
+        monkeypatch.setattr(main, "EXPORT_TOKEN", TOKEN)
+        monkeypatch.setattr(export, "EXPORT_MASK_KEY", "")
+
+        with pytest.raises(RuntimeError, match="EXPORT_MASK_KEY"):
+            asyncio.run(main.startup_event())
@@ -0,0 +1,100 @@
+"""
+Tests for the bounded Argon2id hashing pool.
+
+Tests cover:
+- Hash/verify round trip through the pool
+- Rejection when the pool and its queue are full
+- Jobs that waited too long in the queue are dropped
+- Auth endpoints return 503 while the pool is saturated
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import hashing
+from app.hashing import HashingBusyError, HashingPool
+
+
+def _occupy(pool, release):
+    """Hold one pool slot from a background thread until release is set."""
+    thread = threading.Thread(target=asyncio.run, args=(pool.run(release.wait),))
+    thread.start()
+    deadline = time.monotonic() + 5
+    while pool.in_flight < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return thread
+
+
+class TestHashingPool:
+    """Test admission control of the hashing pool."""
+
+    def test_hash_and_verify_round_trip(self):
+        """Test that hashes produced by the pool verify correctly."""
+
+        async def scenario():
+            password_hash = await hashing.hash_password("s3cret-pass")
+            return (
+                await hashing.verify_password(password_hash, "s3cret-pass"),
+                await hashing.verify_password(password_hash, "wrong-pass"),
+            )
+
+        assert asyncio.run(scenario()) == (True, False)
+
+    def test_rejects_when_saturated(self):
+        """Test that a full pool rejects new jobs immediately."""
+        pool = HashingPool(max_workers=1, queue_size=0, queue_timeout=5)
+        release = threading.Event()
+        thread = _occupy(pool, release)
+        try:
+            with pytest.raises(HashingBusyError):
+                asyncio.run(pool.run(lambda: None))
+        finally:
+            release.set()
+            thread.join()
+            pool.shutdown()
+        assert pool.in_flight == 0
+
+    def test_drops_jobs_that_waited_too_long(self):
+        """Test that queued jobs past the queue timeout are not executed."""
+        pool = HashingPool(max_workers=1, queue_size=1, queue_timeout=0.05)
+        release = threading.Event()
+        thread = _occupy(pool, release)
+        executed = []
+
+        async def queued():
+            task = asyncio.ensure_future(pool.run(executed.append, 1))
+            await asyncio.sleep(0.1)
+            release.set()
+            await task
+
+        try:
+            with pytest.raises(HashingBusyError):
+                asyncio.run(queued())
+        finally:
+            release.set()
+            thread.join()
+            pool.shutdown()
+        assert executed == []
+
+    def test_register_returns_503_when_saturated(self, client, monkeypatch):
+        """Test that auth endpoints answer 503 instead of queueing forever."""
+        pool = HashingPool(max_workers=1, queue_size=0, queue_timeout=5)
+        release = threading.Event()
+        thread = _occupy(pool, release)
+        monkeypatch.setattr(hashing, "pool", pool)
+        try:
+            response = client.post(
+                "/auth/register",
+                params={"username": "busyuser", "password": "busypass123"},
+            )
+        finally:
+            release.set()
+            thread.join()
+            pool.shutdown()
+
+        assert response.status_code == 503
+        assert response.json()["error"]["code"] == "service_unavailable"
+        assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,103 @@
+"""
+Tests for liveness and readiness probes.
+
+Tests cover:
+- /health stays a constant liveness answer
+- /health/ready reports every component with its latency
+- Failing dependencies turn readiness into 503
+- Probe results are cached and concurrent probes share one run
+"""
+
+import asyncio
+
+from app import health
+
+
+class _FakePool:
+    in_flight = 9
+    capacity = 10
+
+
+def test_liveness(client):
+    """Test that /health does not depend on anything."""
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+class TestReadiness:
+    """Test the /health/ready endpoint."""
+
+    def test_ready(self, client):
+        """Test that a healthy instance reports every check as ok."""
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert set(body["checks"]) == {"database", "db_pool", "hashing", "write_queue"}
+        for check in body["checks"].values():
+            assert check["status"] == "ok"
+            assert check["latency_ms"] >= 0
+
+    def test_database_down(self, client, monkeypatch):
+        """Test that an unreachable database makes the instance unavailable."""
+
+        async def ping_db():
+            raise ConnectionRefusedError()
+
+        monkeypatch.setattr(health, "ping_db", ping_db)
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        database = response.json()["checks"]["database"]
+        assert database == {
+            "status": "fail",
+            "error": "ConnectionRefusedError",
+            "latency_ms": database["latency_ms"],
+        }
+
+    def test_hashing_backlog(self, client, monkeypatch):
+        """Test that a saturated hashing pool makes the instance unavailable."""
+        monkeypatch.setattr(health, "hashing_pool", _FakePool())
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["checks"]["hashing"]["in_flight"] == 9
+
+    def test_result_is_cached(self, client, monkeypatch):
+        """Test that repeated probes within the TTL reuse the last result."""
+        pings = []
+
+        async def ping_db():
+            pings.append(1)
+
+        monkeypatch.setattr(health, "ping_db", ping_db)
+
+        first = client.get("/health/ready").json()
+        second = client.get("/health/ready").json()
+
+        assert len(pings) == 1
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert second["checked_at"] == first["checked_at"]
+
+
+def test_concurrent_probes_share_one_run():
+    """Test that simultaneous probes wait for a single check run."""
+    runs = []
+
+    async def slow_check():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return {"status": "ok"}
+
+    probe = health.ReadinessProbe({"slow": slow_check}, ttl=60)
+
+    async def scenario():
+        return await asyncio.gather(*(probe.report() for _ in range(5)))
+
+    reports = asyncio.run(scenario())
+
+    assert len(runs) == 1
+    assert [r["cached"] for r in reports].count(False) == 1
@@ -0,0 +1,85 @@
+"""
+Tests for the /items demo endpoints and their store.
+
+Tests cover:
+- Creating and reading items by id, 404 for unknown ids
+- Ids stay monotonic and are not reused after eviction
+- Oldest items are evicted once ITEMS_MAX_ENTRIES is reached
+- GET /items pagination with the X-Next-Cursor header
+"""
+
+from app.items import ItemStore
+
+
+class TestItemsEndpoints:
+    def test_create_and_get(self, client):
+        """Test that a created item can be read back by id."""
+        created = client.post("/items", params={"name": "Lamp"}).json()
+
+        response = client.get(f"/items/{created['id']}")
+
+        assert response.status_code == 200
+        assert response.json() == {"id": created["id"], "name": "Lamp"}
+
+    def test_unknown_item(self, client):
+        """Test that reading a missing item returns 404."""
+        response = client.get("/items/999")
+
+        assert response.status_code == 404
+        assert response.json()["error"]["code"] == "not_found"
+
+    def test_name_validation(self, client):
+        """Test that names longer than 100 characters are rejected."""
+        response = client.post("/items", params={"name": "x" * 101})
+
+        assert response.status_code == 422
+
+    def test_pagination(self, client):
+        """Test that pages follow the cursor until the last item."""
+        for n in range(5):
+            client.post("/items", params={"name": f"item {n}"})
+
+        first = client.get("/items", params={"limit": 3})
+        second = client.get(
+            "/items", params={"limit": 3, "after": first.headers["X-Next-Cursor"]}
+        )
+
+        assert [item["id"] for item in first.json()] == [1, 2, 3]
+        assert [item["id"] for item in second.json()] == [4, 5]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/items", params={"after": "not-a-cursor"})
+
+        assert response.status_code == 422
+
+
+class TestItemStore:
+    def test_evicts_oldest(self):
+        """Test that the store keeps only the newest max_entries items."""
+        store = ItemStore(max_entries=3)
+        for n in range(5):
+            store.create(f"item {n}")
+
+        assert len(store) == 3
+        assert store.get(2) is None
+        assert store.get(3)["name"] == "item 2"
+
+    def test_ids_not_reused(self):
+        """Test that ids keep increasing after older items are evicted."""
+        store = ItemStore(max_entries=1)
+        store.create("a")
+
+        assert store.create("b")["id"] == 2
+        assert store.create("c")["id"] == 3
+
+    def test_page_after_evicted_id(self):
+        """Test that a cursor pointing at evicted items resumes at the oldest."""
+        store = ItemStore(max_entries=3)
+        for n in range(6):
+            store.create(f"item {n}")
+
+        assert [item["id"] for item in store.page(after=1, limit=2)] == [4, 5]
+        assert [item["id"] for item in store.page(after=5, limit=2)] == [6]
+        assert store.page(after=6) == []
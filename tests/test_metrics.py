@@ -0,0 +1,104 @@
+"""
+Tests for the Prometheus metrics endpoint.
+
+Tests cover:
+- Text exposition of counters, gauges and histograms
+- Request latency labelled by route template and status
+- Database statement, hashing and store size metrics
+- Optional bearer token protection
+"""
+
+from app import main
+from app.metrics import Registry, statement_labels
+
+
+def _sample(text, prefix):
+    """Value of the first exposition line starting with prefix."""
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestExposition:
+    """Test rendering of the text format."""
+
+    def test_histogram_is_cumulative(self):
+        """Test that buckets are cumulative and carry sum and count."""
+        registry = Registry()
+        histogram = registry.histogram(
+            "t_seconds", "Test.", labels=("op",), buckets=(1, 5)
+        )
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value, "read")
+
+        text = registry.render()
+
+        assert 't_seconds_bucket{op="read",le="1"} 2' in text
+        assert 't_seconds_bucket{op="read",le="5"} 3' in text
+        assert 't_seconds_bucket{op="read",le="+Inf"} 4' in text
+        assert 't_seconds_sum{op="read"} 14.5' in text
+        assert 't_seconds_count{op="read"} 4' in text
+
+    def test_counter_gauge_and_callbacks(self):
+        """Test counters, gauges, label escaping and callback values."""
+        registry = Registry()
+        registry.counter("c", "C.", labels=("path",)).inc('/a"b')
+        registry.gauge("g", "G.", callback=lambda: 7)
+        registry.gauge("skipped", "S.", callback=lambda: None)
+
+        text = registry.render()
+
+        assert '# TYPE c counter\nc_total{path="/a\\"b"} 1' in text
+        assert "\ng 7\n" in text
+        assert "\nskipped " not in text
+
+    def test_statement_labels(self):
+        """Test operation/table extraction from SQL."""
+        assert statement_labels("SELECT a FROM suggestions WHERE x") == (
+            "SELECT",
+            "suggestions",
+        )
+        assert statement_labels("UPDATE users SET a=1") == ("UPDATE", "users")
+        assert statement_labels("CREATE TRIGGER t AFTER UPDATE OF x") == ("CREATE", "")
+
+
+class TestMetricsEndpoint:
+    """Test /metrics through the app."""
+
+    def test_request_and_db_metrics(self, client, auth_headers):
+        """Test that requests, statements and stores show up in the output."""
+        auth_headers()
+        client.get("/suggestions/12345")
+        client.get("/no-such-path")
+
+        text = client.get("/metrics").text
+
+        route = 'route="/suggestions/{suggestion_id}",method="GET",status="404"'
+        assert _sample(text, f"http_request_duration_seconds_count{{{route}}}") >= 1
+        unmatched = 'route="unmatched",method="GET",status="404"'
+        assert _sample(text, f"http_request_duration_seconds_count{{{unmatched}}}")
+        assert _sample(
+            text,
+            'db_statement_duration_seconds_count{operation="SELECT",table="users"}',
+        )
+        assert _sample(text, 'argon2_duration_seconds_count{operation="hash"}') >= 1
+        assert _sample(text, 'argon2_duration_seconds_count{operation="verify"}') >= 1
+        assert _sample(text, "token_store_size") == 1
+        assert _sample(text, 'rate_limiter_keys{limiter="rps_ip"}') == 1
+        assert _sample(text, "http_requests_in_flight") == 1
+
+    def test_content_type(self, client):
+        """Test the exposition content type."""
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    def test_token_required_when_configured(self, client, monkeypatch):
+        """Test that METRICS_TOKEN protects the endpoint."""
+        monkeypatch.setattr(main, "METRICS_TOKEN", "scrape-secret")
+
+        assert client.get("/metrics").status_code == 401
+        wrong = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+        ok = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert ok.status_code == 200
@@ -0,0 +1,140 @@
+"""
+Tests for schema migrations and the list query indexes.
+
+Tests cover:
+- Fresh schemas are created at the latest version with nothing to migrate
+- Version 1 databases get the composite indexes, old indexes are dropped
+- Databases from before versioning are brought up to date, data intact
+- Status and owner list queries are served by the composite indexes
+"""
+
+import asyncio
+
+from sqlalchemy import inspect, text
+
+from app.database import (
+    SCHEMA_VERSION,
+    _suggestions_query,
+    engine,
+    get_schema_version_db,
+    schema_version_table,
+    search_suggestions_db,
+)
+from app.migrations import MIGRATIONS, migrate
+
+LEGACY_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER PRIMARY KEY, username VARCHAR(50) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL)""",
+    """CREATE TABLE suggestions (
+        id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL,
+        title VARCHAR(200) NOT NULL, text TEXT NOT NULL, status VARCHAR(50))""",
+    "CREATE INDEX ix_suggestions_user_id ON suggestions (user_id)",
+    "CREATE INDEX ix_suggestions_status ON suggestions (status)",
+    """INSERT INTO suggestions (user_id, title, text, status)
+    VALUES (1, 'Bike racks', 'More bike racks near the library', 'new')""",
+]
+
+
+async def _execute(*statements):
+    async with engine.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement))
+
+
+async def _indexes():
+    async with engine.connect() as conn:
+        return await conn.run_sync(
+            lambda sync_conn: {
+                index["name"] for index in inspect(sync_conn).get_indexes("suggestions")
+            }
+        )
+
+
+async def _plan(query) -> str:
+    sql = query.compile(engine, compile_kwargs={"literal_binds": True})
+    async with engine.connect() as conn:
+        result = await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return "\n".join(row[-1] for row in result)
+
+
+class TestMigrate:
+    def test_versions_are_sequential(self):
+        """Test that migrations are numbered 1..SCHEMA_VERSION in order."""
+        versions = [migration.version for migration in MIGRATIONS]
+
+        assert versions == list(range(1, SCHEMA_VERSION + 1))
+
+    def test_index_builds_run_outside_transactions(self):
+        """Test that migrations building indexes can use CREATE INDEX CONCURRENTLY."""
+        by_version = {migration.version: migration for migration in MIGRATIONS}
+
+        assert not by_version[1].transactional
+        assert not by_version[2].transactional
+
+    def test_fresh_database_needs_no_migrations(self, empty_db):
+        """Test that a new database is created at the latest version."""
+        assert asyncio.run(migrate()) == []
+        assert asyncio.run(get_schema_version_db()) == SCHEMA_VERSION
+        assert {"ix_suggestions_status_id", "ix_suggestions_user_id_id"} <= (
+            asyncio.run(_indexes())
+        )
+
+    def test_upgrades_version_1(self, empty_db):
+        """Test that a version 1 database swaps its indexes for composite ones."""
+        asyncio.run(migrate())
+        asyncio.run(
+            _execute(
+                "DROP INDEX ix_suggestions_status_id",
+                "DROP INDEX ix_suggestions_user_id_id",
+                "CREATE INDEX ix_suggestions_status ON suggestions (status)",
+                "CREATE INDEX ix_suggestions_user_id ON suggestions (user_id)",
+                "UPDATE schema_version SET version = 1",
+            )
+        )
+
+        assert asyncio.run(migrate()) == [2, 3]
+        assert asyncio.run(migrate()) == []
+        indexes = asyncio.run(_indexes())
+        assert {"ix_suggestions_status_id", "ix_suggestions_user_id_id"} <= indexes
+        assert not {"ix_suggestions_status", "ix_suggestions_user_id"} & indexes
+
+    def test_upgrades_unversioned_database(self, empty_db):
+        """Test that a pre-versioning database is migrated with its rows intact."""
+        asyncio.run(_execute(*LEGACY_SCHEMA))
+        assert asyncio.run(get_schema_version_db()) == 0
+
+        assert asyncio.run(migrate()) == [1, 2, 3]
+        assert asyncio.run(get_schema_version_db()) == SCHEMA_VERSION
+
+        hits = asyncio.run(search_suggestions_db("bike", limit=10))
+        assert [(hit["title"], hit["version"]) for hit in hits] == [("Bike racks", 1)]
+        assert "ix_suggestions_status_id" in asyncio.run(_indexes())
+
+    def test_records_each_migration(self, empty_db):
+        """Test that every applied migration is recorded in schema_version."""
+        asyncio.run(_execute(*LEGACY_SCHEMA))
+        asyncio.run(migrate())
+
+        async def versions():
+            async with engine.connect() as conn:
+                result = await conn.execute(schema_version_table.select())
+                return sorted(row.version for row in result)
+
+        assert asyncio.run(versions()) == [1, 2, 3]
+
+
+class TestListIndexes:
+    def test_status_list_uses_status_id_index(self, test_db):
+        """Test that status-filtered pages are read in id order from one index."""
+        plan = asyncio.run(_plan(_suggestions_query("new", after=10).limit(20)))
+
+        assert "ix_suggestions_status_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_owner_list_uses_user_id_id_index(self, test_db):
+        """Test that per-owner pages are read in id order from one index."""
+        plan = asyncio.run(_plan(_suggestions_query(after=10, user_id=1).limit(20)))
+
+        assert "ix_suggestions_user_id_id" in plan
+        assert "TEMP B-TREE" not in plan
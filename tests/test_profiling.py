@@ -0,0 +1,110 @@
+"""
+Tests for per-request database profiling.
+
+Tests cover:
+- Query count, DB time and connection checkouts in the X-DB-Profile header
+- No header unless DB_PROFILE_HEADER is enabled
+- Warnings for requests checking out several connections and for N+1 patterns
+- Slow statements are logged with their parameter values redacted
+"""
+
+import logging
+
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app import profiling
+from app.database import engine
+from app.profiling import QueryProfileMiddleware, RequestProfile, redact
+
+
+def _profile(response) -> dict:
+    fields = (part.split("=") for part in response.headers["X-DB-Profile"].split("; "))
+    return {name: float(value) for name, value in fields}
+
+
+class TestProfileHeader:
+    def test_counts_queries_and_checkouts(
+        self, client, auth_headers, profile_header, create_suggestion
+    ):
+        """Test that a DB-backed request reports its queries and checkouts."""
+        headers = auth_headers()
+        created = create_suggestion(headers)
+
+        response = client.get(f"/suggestions/{created['id']}")
+
+        profile = _profile(response)
+        assert profile["queries"] >= 1
+        assert profile["checkouts"] >= 1
+        assert profile["db_ms"] > 0
+
+    def test_requests_without_database(self, client, profile_header):
+        """Test that a request not touching the database reports zeros."""
+        response = client.get("/health")
+
+        assert _profile(response) == {"queries": 0, "db_ms": 0, "checkouts": 0}
+
+    def test_disabled_by_default(self, client):
+        """Test that the header is only sent when enabled."""
+        response = client.get("/health")
+
+        assert "X-DB-Profile" not in response.headers
+
+
+class TestWarnings:
+    def test_several_checkouts(self, test_db, caplog):
+        """Test that requests using more than one connection are reported."""
+
+        async def two_connections(scope, receive, send):
+            for _ in range(2):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            await PlainTextResponse("ok")(scope, receive, send)
+
+        client = TestClient(QueryProfileMiddleware(two_connections))
+        with caplog.at_level(logging.WARNING, logger="app.profiling"):
+            client.get("/report")
+
+        assert any(
+            "GET /report checked out 2 connections" in record.message
+            for record in caplog.records
+        )
+
+    def test_repeated_statements(self):
+        """Test that statements run threshold times or more are reported."""
+        profile = RequestProfile()
+        for _ in range(3):
+            profile.record("SELECT * FROM users WHERE id = ?", 0.001)
+        profile.record("SELECT 1", 0.001)
+
+        assert profile.repeated(3) == [("SELECT * FROM users WHERE id = ?", 3)]
+        assert profile.queries == 4
+
+    def test_n_plus_one_logged(self, client, auth_headers, caplog, monkeypatch):
+        """Test that a request repeating a statement logs a possible N+1."""
+        monkeypatch.setattr(profiling, "DB_N_PLUS_ONE_THRESHOLD", 1)
+
+        with caplog.at_level(logging.WARNING, logger="app.profiling"):
+            client.get("/suggestions")
+
+        assert any("possible N+1" in record.message for record in caplog.records)
+
+
+class TestSlowQueryLog:
+    def test_values_are_redacted(self, client, auth_headers, caplog, monkeypatch):
+        """Test that slow statements are logged without parameter values."""
+        monkeypatch.setattr(profiling, "DB_SLOW_QUERY_MS", 0)
+
+        with caplog.at_level(logging.WARNING, logger="app.profiling"):
+            auth_headers("slowpoke", "secret-password-1")
+
+        slow = [r.message for r in caplog.records if r.message.startswith("slow query")]
+        assert any("FROM users" in message for message in slow)
+        assert not any("slowpoke" in message for message in slow)
+
+    def test_redact(self):
+        """Test that parameter structure is kept and values are dropped."""
+        assert redact({"username": "alice", "id": 1}) == {"username": "?", "id": "?"}
+        assert redact(("alice", 1)) == ("?", "?")
+        assert redact([("a",), ("b",)], executemany=True) == "<2 parameter sets>"
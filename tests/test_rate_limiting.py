@@ -6,8 +6,21 @@ Tests cover:
 - Rate limiting by IP (10 attempts per 60 seconds)
 - Rate limit reset after successful login
 - Rate limit window expiration
+- Bounded memory of the limiter and the shared SQL backend, whose acquire
+  is one atomic statement and whose hits for several limiters share one
+  transaction
+- Global, per-IP and per-user request limits in the middleware
 """
 
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from app import main
+from app.database import add_rate_limit_hit_db, engine
+from app.ratelimit import MemoryRateLimiter, SqlRateLimiter, acquire_all
+
 
 class TestRateLimiting:
     """Test rate limiting on authentication endpoints."""
@@ -168,3 +181,149 @@ class TestRateLimiting:
 
         assert response.status_code == 429
         assert "too_many_requests" in response.json()["error"]["code"]
+
+
+class TestSlidingWindowLimiter:
+    """Test the limiter implementations directly."""
+
+    def test_acquire_blocks_at_limit(self):
+        """Test that acquire refuses hits once the limit is reached."""
+        limiter = MemoryRateLimiter("test", 3, 60)
+        results = [asyncio.run(limiter.acquire("k")) for _ in range(4)]
+        assert results == [True, True, True, False]
+        assert asyncio.run(limiter.count("k")) == 3
+
+    def test_hits_expire_after_window(self):
+        """Test that hits are forgotten once the window has passed."""
+        limiter = MemoryRateLimiter("test", 2, 0.2)
+        asyncio.run(limiter.add("k"))
+        asyncio.run(limiter.add("k"))
+        assert asyncio.run(limiter.exceeded("k"))
+
+        time.sleep(0.25)
+        assert not asyncio.run(limiter.exceeded("k"))
+
+    def test_key_count_is_bounded(self):
+        """Test that a flood of distinct keys does not grow memory unboundedly."""
+        limiter = MemoryRateLimiter("test", 5, 60, max_keys=100)
+        for i in range(1000):
+            asyncio.run(limiter.add(f"user{i}"))
+        assert len(limiter) == 100
+        assert asyncio.run(limiter.count("user999")) == 1
+        assert asyncio.run(limiter.count("user0")) == 0
+
+    def test_sql_backend(self, test_db):
+        """Test counting, reset and isolation of keys in the SQL backend."""
+        limiter = SqlRateLimiter("test", 2, 60)
+        other = SqlRateLimiter("other", 2, 60)
+        assert asyncio.run(limiter.acquire("k"))
+        assert asyncio.run(limiter.acquire("k"))
+        assert not asyncio.run(limiter.acquire("k"))
+        assert asyncio.run(other.count("k")) == 0
+
+        asyncio.run(limiter.reset("k"))
+        assert asyncio.run(limiter.count("k")) == 0
+
+    def test_sql_acquire_is_atomic(self, test_db):
+        """Test that concurrent acquires admit exactly limit hits and record no more."""
+        limiter = SqlRateLimiter("test", 3, 60)
+
+        async def scenario():
+            return await asyncio.gather(*(limiter.acquire("k") for _ in range(8)))
+
+        assert sum(asyncio.run(scenario())) == 3
+        assert asyncio.run(limiter.count("k")) == 3
+
+    def test_sql_acquire_counts_earlier_slots(self, test_db):
+        """Test that hits in earlier slots of the window count toward the limit."""
+        limiter = SqlRateLimiter("test", 2, 60)
+        earlier = limiter._slot(time.time()) - 1
+        for _ in range(2):
+            asyncio.run(add_rate_limit_hit_db("test:k", earlier, time.time() + 60))
+
+        assert not asyncio.run(limiter.acquire("k"))
+        assert asyncio.run(limiter.count("k")) == 2
+
+    def test_acquire_all_shares_one_connection(self, test_db):
+        """Test that SQL hits of several limiters take one connection, in order."""
+        ip = SqlRateLimiter("ip", 5, 60)
+        user = SqlRateLimiter("user", 1, 60)
+        other = SqlRateLimiter("other", 5, 60)
+        asyncio.run(user.acquire("k"))
+        checkouts = []
+
+        def count(*args):
+            checkouts.append(args)
+
+        event.listen(engine.sync_engine, "checkout", count)
+        try:
+            rejected = asyncio.run(acquire_all([(ip, "k"), (user, "k"), (other, "k")]))
+        finally:
+            event.remove(engine.sync_engine, "checkout", count)
+
+        assert rejected == 1
+        assert len(checkouts) == 1
+        assert asyncio.run(ip.count("k")) == 1
+        assert asyncio.run(other.count("k")) == 0
+
+    def test_acquire_all_mixed_backends(self, test_db):
+        """Test that memory and SQL limiters are acquired in order."""
+        memory = MemoryRateLimiter("memory", 1, 60)
+        sql = SqlRateLimiter("sql", 5, 60)
+        assert asyncio.run(acquire_all([(sql, "k"), (memory, "k")])) is None
+        assert asyncio.run(acquire_all([(sql, "k"), (memory, "k")])) == 1
+        assert asyncio.run(sql.count("k")) == 2
+
+
+class TestRequestRateLimits:
+    """Test the NFR-05 request limits enforced by the middleware."""
+
+    def test_ip_limit(self, client, monkeypatch):
+        """Test that requests from one IP beyond the limit get 429."""
+        monkeypatch.setitem(
+            main._REQUEST_LIMITS, "ip", MemoryRateLimiter("rps_ip", 3, 1)
+        )
+        statuses = [client.get("/suggestions").status_code for _ in range(4)]
+
+        assert statuses == [200, 200, 200, 429]
+        response = client.get("/suggestions")
+        assert response.json()["error"]["code"] == "too_many_requests"
+        assert response.headers["Retry-After"] == "1"
+
+    def test_health_is_exempt(self, client, monkeypatch):
+        """Test that liveness probes are never rate limited."""
+        monkeypatch.setitem(
+            main._REQUEST_LIMITS, "global", MemoryRateLimiter("rps_global", 1, 1)
+        )
+        statuses = [client.get("/health").status_code for _ in range(3)]
+        assert statuses == [200, 200, 200]
+
+    def test_user_limit(self, client, auth_headers, monkeypatch):
+        """Test that one user cannot exceed the per-user limit."""
+        headers = auth_headers()
+        monkeypatch.setitem(
+            main._REQUEST_LIMITS, "user", MemoryRateLimiter("rps_user", 2, 1)
+        )
+        statuses = [
+            client.get("/auth/token-info", headers=headers).status_code
+            for _ in range(3)
+        ]
+
+        assert statuses == [200, 200, 429]
+        assert client.get("/suggestions").status_code == 200
+
+    def test_sql_limits(self, client, auth_headers, monkeypatch):
+        """Test the middleware with the IP and user limits in the SQL backend."""
+        headers = auth_headers()
+        monkeypatch.setitem(main._REQUEST_LIMITS, "ip", SqlRateLimiter("rps_ip", 5, 1))
+        monkeypatch.setitem(
+            main._REQUEST_LIMITS, "user", SqlRateLimiter("rps_user", 2, 1)
+        )
+        statuses = [
+            client.get("/auth/token-info", headers=headers).status_code
+            for _ in range(3)
+        ]
+
+        assert statuses == [200, 200, 429]
+        response = client.get("/auth/token-info", headers=headers)
+        assert response.json()["error"]["message"] == "Too many requests for this user"
@@ -0,0 +1,133 @@
+"""
+Tests for full-text search over suggestions.
+
+Tests cover:
+- Title matches rank above text matches; all words must match
+- Highlights are HTML-escaped and wrap matches in <mark>
+- Relevance-ordered keyset pagination
+- Status filter
+- Updates and deletes keep the search index in sync
+"""
+
+from app.pagination import encode_rank_cursor
+
+
+def _search(client, **params):
+    response = client.get("/suggestions/search", params=params)
+    assert response.status_code == 200
+    return response
+
+
+class TestSearch:
+    """Test search matching, ranking and highlighting."""
+
+    def test_title_match_ranks_first(self, client, auth_headers, create_suggestion):
+        """Test that a match in the title outranks a match in the text."""
+        headers = auth_headers()
+        create_suggestion(headers, "Canteen menu", "Add a parking lot near the gym")
+        create_suggestion(headers, "Parking lot", "More spaces please")
+        create_suggestion(headers, "Library hours", "Open on weekends")
+
+        hits = _search(client, q="parking").json()
+
+        assert [h["title"] for h in hits] == ["Parking lot", "Canteen menu"]
+        assert hits[0]["rank"] > hits[1]["rank"]
+
+    def test_all_words_must_match(self, client, auth_headers, create_suggestion):
+        """Test that every word of the query has to occur."""
+        headers = auth_headers()
+        create_suggestion(headers, "Bike racks", "Install bike racks at entrance")
+        create_suggestion(headers, "Bike repair", "Free repair station")
+
+        hits = _search(client, q="bike repair").json()
+
+        assert [h["title"] for h in hits] == ["Bike repair"]
+
+    def test_highlight_is_escaped(self, client, auth_headers, create_suggestion):
+        """Test that highlights mark matches without passing through raw HTML."""
+        headers = auth_headers()
+        create_suggestion(headers, "<b>Wifi</b> upgrade", "Wifi is <i>slow</i>")
+
+        (hit,) = _search(client, q="wifi").json()
+
+        assert hit["title_highlight"] == "&lt;b&gt;<mark>Wifi</mark>&lt;/b&gt; upgrade"
+        assert "<mark>Wifi</mark>" in hit["snippet"]
+        assert "<i>" not in hit["snippet"]
+
+    def test_no_words(self, client):
+        """Test that a query without words matches nothing."""
+        assert _search(client, q="?!").json() == []
+
+    def test_requires_query(self, client):
+        """Test that q is mandatory."""
+        assert client.get("/suggestions/search").status_code == 422
+
+
+class TestSearchPagination:
+    """Test paging through ranked results."""
+
+    def test_pages_cover_all_hits_once(self, client, auth_headers, create_suggestion):
+        """Test that following X-Next-Cursor visits every hit exactly once."""
+        headers = auth_headers()
+        for i in range(5):
+            create_suggestion(headers, f"Coffee {i}", "coffee " * (i + 1))
+
+        seen, cursor = [], None
+        while True:
+            params = {"q": "coffee", "limit": 2}
+            if cursor:
+                params["after"] = cursor
+            response = _search(client, **params)
+            page = response.json()
+            seen += page
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert len(seen) == 5
+        assert len({h["id"] for h in seen}) == 5
+        ranks = [h["rank"] for h in seen]
+        assert ranks == sorted(ranks, reverse=True)
+
+    def test_invalid_cursor(self, client):
+        """Test that malformed cursors are rejected."""
+        response = client.get(
+            "/suggestions/search", params={"q": "x", "after": "garbage"}
+        )
+        assert response.status_code == 422
+
+    def test_cursor_id_out_of_range(self, client):
+        """Test that a rank cursor id beyond the id column range is rejected."""
+        cursor = encode_rank_cursor(0.5, 2**70)
+        response = client.get("/suggestions/search", params={"q": "a", "after": cursor})
+        assert response.status_code == 422
+
+
+class TestSearchIndexSync:
+    """Test that writes are reflected in search results."""
+
+    def test_status_filter(self, client, auth_headers, create_suggestion):
+        """Test that the status filter applies to search results."""
+        headers = auth_headers()
+        create_suggestion(headers, "Solar panels", status="approved")
+        create_suggestion(headers, "Solar lamps")
+
+        hits = _search(client, q="solar", status="approved").json()
+
+        assert [h["title"] for h in hits] == ["Solar panels"]
+
+    def test_update_and_delete(self, client, auth_headers, create_suggestion):
+        """Test that updated and deleted suggestions are reindexed."""
+        headers = auth_headers()
+        changed = create_suggestion(headers, "Old title")
+        removed = create_suggestion(headers, "Old news")
+
+        client.put(
+            f"/suggestions/{changed['id']}",
+            headers=headers,
+            json={"title": "New title", "text": "Text"},
+        )
+        client.delete(f"/suggestions/{removed['id']}", headers=headers)
+
+        assert _search(client, q="old").json() == []
+        assert [h["id"] for h in _search(client, q="new").json()] == [changed["id"]]
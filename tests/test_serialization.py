@@ -0,0 +1,68 @@
+"""
+Tests for the FAST_JSON list serialisation path.
+
+Tests cover:
+- The fast encoder produces the same JSON as response_model serialisation
+- List endpoints keep their headers and body shape with FAST_JSON on
+- List queries return rows holding exactly the output fields
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app import main
+from app.database import get_suggestions_db
+from app.serialization import SUGGESTION_FIELDS, encode_suggestions
+from bench.serialization import fastapi_encoder, make_rows
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    monkeypatch.setattr(main, "FAST_JSON", True)
+
+
+def test_encoder_matches_response_model():
+    """Test that both paths encode a page to the same JSON."""
+    rows = make_rows(50)
+    rows[0]["title"] = 'Quotes " and \\ and ünïcode  '
+
+    assert encode_suggestions(rows) == fastapi_encoder()(rows)
+    assert tuple(json.loads(encode_suggestions(rows))[0]) == SUGGESTION_FIELDS
+
+
+def test_list_with_fast_json(client, auth_headers, fast_json):
+    """Test that pages, cursors and ETags are unchanged by the fast path."""
+    headers = auth_headers()
+    for i in range(3):
+        client.post(
+            "/suggestions",
+            headers=headers,
+            json={"title": f"Fast {i}", "text": "Text"},
+        )
+
+    response = client.get("/suggestions", params={"limit": 2})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "ETag" in response.headers and "X-Next-Cursor" in response.headers
+    assert [s["title"] for s in response.json()] == ["Fast 0", "Fast 1"]
+    assert set(response.json()[0]) == {"id", "user_id", "title", "text", "status"}
+
+    etag = response.headers["ETag"]
+    response = client.get(
+        "/suggestions", params={"limit": 2}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    response = client.get("/suggestions/mine", headers=headers)
+    assert [s["title"] for s in response.json()] == ["Fast 0", "Fast 1", "Fast 2"]
+
+
+def test_list_rows_hold_only_output_fields(client, auth_headers, create_suggestion):
+    """Test that list queries return rows ready to encode, without internal columns."""
+    create_suggestion(auth_headers())
+
+    rows = asyncio.run(get_suggestions_db(limit=10))
+
+    assert tuple(rows[0]) == SUGGESTION_FIELDS
@@ -0,0 +1,232 @@
+"""
+Tests for suggestion statistics.
+
+Tests cover:
+- GET /suggestions/stats counts by status, overall and per user
+- Counters follow creates, updates, status changes, deletes and batches
+- Group-committed creates are counted
+- Reconciliation corrects drifted counters and reports the drift
+- Reconciliation is skipped while another instance holds the lock
+- Reconciliation runs in the background, never from a stats read
+- Existing suggestions are counted when the counters are added by migration
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+
+from app.database import engine, get_suggestion_counts_db
+from app.migrations import migrate
+from app.stats import CountReconciler
+from app.writebehind import SuggestionWriter
+
+
+def _stats(client, **params):
+    response = client.get("/suggestions/stats", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _execute(*statements):
+    async with engine.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement))
+
+
+class TestStatsEndpoint:
+    def test_empty(self, client):
+        """Test that every status is reported, with zeros, before any writes."""
+        assert _stats(client) == {
+            "user_id": None,
+            "total": 0,
+            "by_status": {"new": 0, "reviewing": 0, "approved": 0, "rejected": 0},
+        }
+
+    def test_overall_and_per_user(self, client, auth_headers, create_suggestion):
+        """Test that counts are kept overall and for each owner."""
+        alice = auth_headers()
+        bob = auth_headers("other", "pass12345")
+        create_suggestion(alice, status="new")
+        create_suggestion(alice, status="approved")
+        mine = create_suggestion(bob, status="approved")
+
+        overall = _stats(client)
+        assert overall["total"] == 3
+        assert overall["by_status"]["new"] == 1
+        assert overall["by_status"]["approved"] == 2
+
+        per_user = _stats(client, user_id=mine["user_id"])
+        assert per_user["user_id"] == mine["user_id"]
+        assert per_user["total"] == 1
+        assert per_user["by_status"]["approved"] == 1
+
+    def test_invalid_user_id(self, client):
+        """Test that user ids outside the id column range are rejected."""
+        for user_id in (0, 2**31, 2**70):
+            response = client.get("/suggestions/stats", params={"user_id": user_id})
+
+            assert response.status_code == 422
+
+
+class TestCounters:
+    def test_update_and_delete(self, client, auth_headers, create_suggestion):
+        """Test that status changes move counts and deletes remove them."""
+        headers = auth_headers()
+        first = create_suggestion(headers)
+        second = create_suggestion(headers)
+
+        client.put(
+            f"/suggestions/{first['id']}",
+            headers=headers,
+            json={"title": "Title", "text": "Text", "status": "rejected"},
+        )
+        client.put(
+            f"/suggestions/{second['id']}",
+            headers=headers,
+            json={"title": "Renamed", "text": "Text", "status": "new"},
+        )
+        assert _stats(client)["by_status"] == {
+            "new": 1,
+            "reviewing": 0,
+            "approved": 0,
+            "rejected": 1,
+        }
+
+        client.delete(f"/suggestions/{first['id']}", headers=headers)
+        stats = _stats(client, user_id=first["user_id"])
+        assert stats["total"] == 1
+        assert stats["by_status"]["rejected"] == 0
+
+    def test_batch_and_bulk_status(self, client, auth_headers, create_suggestion):
+        """Test that batch writes and PATCH /suggestions/status are counted."""
+        headers = auth_headers()
+        doomed = create_suggestion(headers)
+        response = client.post(
+            "/suggestions:batch",
+            headers=headers,
+            json={
+                "create": [
+                    {"title": "One", "text": "Text"},
+                    {"title": "Two", "text": "Text", "status": "approved"},
+                ],
+                "delete": [doomed["id"]],
+            },
+        )
+        ids = [r["id"] for r in response.json()["results"] if r["op"] == "create"]
+        client.patch(
+            "/suggestions/status",
+            headers=headers,
+            json={"ids": ids, "status": "reviewing"},
+        )
+
+        stats = _stats(client)
+        assert stats["total"] == 2
+        assert stats["by_status"]["reviewing"] == 2
+        assert stats["by_status"]["new"] == 0
+        assert stats["by_status"]["approved"] == 0
+
+    def test_group_commit(self, client):
+        """Test that suggestions written by one multi-row insert are counted."""
+        writer = SuggestionWriter(max_batch=10, max_delay=0.05, queue_size=10)
+
+        async def scenario():
+            await asyncio.gather(
+                *(writer.create(7, f"Title {i}", "Text", "new") for i in range(5))
+            )
+
+        asyncio.run(scenario())
+
+        assert asyncio.run(get_suggestion_counts_db(7)) == {"new": 5}
+        assert _stats(client)["total"] == 5
+
+
+class TestReconciliation:
+    def test_corrects_drift(self, client, auth_headers, create_suggestion):
+        """Test that a recount repairs counters and reports what was off."""
+        headers = auth_headers()
+        create_suggestion(headers)
+        create_suggestion(headers, status="approved")
+        asyncio.run(
+            _execute(
+                "UPDATE suggestion_counts SET count = count + 3 WHERE status = 'new'",
+                "DELETE FROM suggestion_counts WHERE status = 'approved'",
+            )
+        )
+
+        assert asyncio.run(CountReconciler().run()) == 4
+        assert _stats(client)["by_status"]["new"] == 1
+        assert _stats(client)["by_status"]["approved"] == 1
+        assert asyncio.run(CountReconciler().run()) == 0
+
+    def test_skipped_while_locked_elsewhere(
+        self, client, auth_headers, create_suggestion, monkeypatch
+    ):
+        """Test that a recount is skipped when another instance holds the lock."""
+        create_suggestion(auth_headers())
+        asyncio.run(_execute("UPDATE suggestion_counts SET count = count + 3"))
+
+        @asynccontextmanager
+        async def held(key):
+            yield False
+
+        monkeypatch.setattr("app.database.try_advisory_lock", held)
+
+        assert asyncio.run(CountReconciler().run()) is None
+        assert _stats(client)["total"] == 4
+
+    def test_runs_periodically_in_background(self, test_db, monkeypatch):
+        """Test that the started reconciler recounts once per interval until stopped."""
+        runs = []
+
+        async def counting():
+            runs.append(1)
+            return 0
+
+        monkeypatch.setattr("app.stats.reconcile_suggestion_counts_db", counting)
+        reconciler = CountReconciler(interval=0.01)
+
+        async def scenario():
+            reconciler.start()
+            reconciler.start()
+            await asyncio.sleep(0.05)
+            await reconciler.stop()
+            stopped = len(runs)
+            await asyncio.sleep(0.03)
+            return stopped
+
+        stopped = asyncio.run(scenario())
+
+        assert stopped >= 2
+        assert len(runs) == stopped
+
+    def test_endpoint_does_not_recount(self, client, monkeypatch):
+        """Test that stats reads never trigger a recount themselves."""
+        calls = []
+
+        async def counting():
+            calls.append(1)
+            return 0
+
+        monkeypatch.setattr("app.stats.reconcile_suggestion_counts_db", counting)
+
+        _stats(client)
+
+        assert calls == []
+
+
+class TestMigration:
+    def test_counts_existing_suggestions(self, test_db):
+        """Test that migrating a version 2 database counts its suggestions."""
+        asyncio.run(
+            _execute(
+                "INSERT INTO suggestions (user_id, title, text, status, version) "
+                "VALUES (1, 'A', 'Text', 'new', 1), (2, 'B', 'Text', 'approved', 1)",
+                "DELETE FROM suggestion_counts",
+                "UPDATE schema_version SET version = 2",
+            )
+        )
+
+        assert asyncio.run(migrate()) == [3]
+        assert asyncio.run(get_suggestion_counts_db()) == {"new": 1, "approved": 1}
+        assert asyncio.run(get_suggestion_counts_db(2)) == {"approved": 1}
@@ -1,5 +1,10 @@
 """Basic tests for suggestions CRUD operations."""
 
+import json
+
+from app.entities import SuggestionOut
+from app.pagination import encode_cursor
+
 
 def test_create_suggestion_success(client, auth_headers):
     """Test successful suggestion creation."""
@@ -80,3 +85,117 @@ def test_create_suggestion_invalid_status(client, auth_headers):
         json={"title": "Test", "text": "Test", "status": "invalid_status"},
     )
     assert response.status_code == 422
+
+
+def test_list_suggestions_keyset_pagination(client, auth_headers):
+    """Test that pages follow the X-Next-Cursor header without overlap."""
+    headers = auth_headers()
+    for i in range(5):
+        client.post(
+            "/suggestions",
+            headers=headers,
+            json={"title": f"Suggestion {i}", "text": "Text"},
+        )
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/suggestions", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(s["id"] for s in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "after": cursor}
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_list_suggestions_invalid_cursor(client):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/suggestions", params={"after": "not-a-cursor"})
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "validation_error"
+
+
+def test_list_suggestions_cursor_id_out_of_range(client):
+    """Test that a cursor id beyond the id column range is rejected, not a 500."""
+    cursor = encode_cursor(2**70)
+    response = client.get("/suggestions", params={"after": cursor})
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "validation_error"
+
+
+def test_list_suggestions_ndjson_stream(client, auth_headers):
+    """Test streaming all suggestions as NDJSON."""
+    headers = auth_headers()
+    for i in range(3):
+        client.post(
+            "/suggestions",
+            headers=headers,
+            json={"title": f"Streamed {i}", "text": "Text", "status": "reviewing"},
+        )
+
+    response = client.get(
+        "/suggestions", params={"stream": "true", "status": "reviewing"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["title"] for r in rows] == ["Streamed 0", "Streamed 1", "Streamed 2"]
+    assert all(set(r) == set(SuggestionOut.model_fields) for r in rows)
+
+
+def test_list_my_suggestions(client, auth_headers):
+    """Test that /suggestions/mine pages through the caller's own suggestions."""
+    mine = auth_headers()
+    other = auth_headers("other", "pass12345")
+    for i in range(3):
+        for headers in (mine, other):
+            client.post(
+                "/suggestions",
+                headers=headers,
+                json={"title": f"Suggestion {i}", "text": "Text"},
+            )
+
+    response = client.get("/suggestions/mine", headers=mine, params={"limit": 2})
+    assert response.status_code == 200
+    first = response.json()
+    response = client.get(
+        "/suggestions/mine",
+        headers=mine,
+        params={"limit": 2, "after": response.headers["X-Next-Cursor"]},
+    )
+    assert "X-Next-Cursor" not in response.headers
+    page = first + response.json()
+
+    assert len(page) == 3
+    assert len({s["user_id"] for s in page}) == 1
+    assert [s["id"] for s in page] == sorted(s["id"] for s in page)
+
+
+def test_list_my_suggestions_status_filter(client, auth_headers):
+    """Test filtering the caller's suggestions by status."""
+    headers = auth_headers()
+    for status in ("new", "approved", "new"):
+        client.post(
+            "/suggestions",
+            headers=headers,
+            json={"title": "Title", "text": "Text", "status": status},
+        )
+
+    response = client.get(
+        "/suggestions/mine", headers=headers, params={"status": "approved"}
+    )
+    assert response.status_code == 200
+    assert [s["status"] for s in response.json()] == ["approved"]
+
+
+def test_list_my_suggestions_requires_auth(client):
+    """Test that /suggestions/mine rejects anonymous requests."""
+    response = client.get("/suggestions/mine")
+    assert response.status_code == 401
+    assert response.json()["error"]["code"] == "auth_required"
@@ -0,0 +1,206 @@
+"""
+Tests for access token stores.
+
+Tests cover:
+- Expired tokens are evicted from the in-memory store
+- SQL-backed store round trip, expiry and hashed storage
+- Signed JWT tokens: validation, tampering, expiry and revocation
+- JWT mode refuses to start without a shared JWT_SECRET
+- Logout invalidates the token; expired tokens are reported as token_expired
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app import main
+from app.database import engine, tokens_table
+from app.tokens import (
+    JwtTokenIssuer,
+    MemoryTokenStore,
+    SqlTokenStore,
+    create_token_issuer,
+    decode_jwt,
+    encode_jwt,
+)
+
+SECRET = b"test-secret"
+
+
+async def _token_rows():
+    async with engine.connect() as conn:
+        result = await conn.execute(tokens_table.select())
+        return result.fetchall()
+
+
+class TestMemoryTokenStore:
+    """Test the heap-indexed in-memory store."""
+
+    def test_get_returns_live_token(self):
+        """Test that a stored token can be read back."""
+        store = MemoryTokenStore(ttl=60)
+        now = time.time()
+        asyncio.run(store.put("tok", 7, now))
+
+        assert asyncio.run(store.get("tok")) == {
+            "user_id": 7,
+            "created_at": now,
+            "expires_at": now + 60,
+        }
+
+    def test_expired_tokens_are_evicted(self):
+        """Test that expired tokens disappear without a full scan."""
+        store = MemoryTokenStore(ttl=60)
+        old = time.time() - 120
+        for i in range(100):
+            asyncio.run(store.put(f"old-{i}", i, old))
+        asyncio.run(store.put("fresh", 1, time.time()))
+
+        assert len(store) == 1
+        assert asyncio.run(store.get("old-0")) is None
+        assert asyncio.run(store.get("fresh"))["user_id"] == 1
+
+    def test_delete(self):
+        """Test that deleted tokens are no longer returned."""
+        store = MemoryTokenStore(ttl=60)
+        asyncio.run(store.put("tok", 1, time.time()))
+        asyncio.run(store.delete("tok"))
+
+        assert asyncio.run(store.get("tok")) is None
+
+
+class TestSqlTokenStore:
+    """Test the shared SQL-backed store."""
+
+    def test_round_trip_and_delete(self, test_db):
+        """Test put/get/delete against the tokens table."""
+        store = SqlTokenStore(ttl=60)
+        now = time.time()
+        asyncio.run(store.put("tok", 3, now))
+
+        assert asyncio.run(store.get("tok")) == {
+            "user_id": 3,
+            "created_at": now,
+            "expires_at": now + 60,
+        }
+        asyncio.run(store.delete("tok"))
+        assert asyncio.run(store.get("tok")) is None
+
+    def test_expired_token_is_purged(self, test_db):
+        """Test that expired rows are reported as such until purged."""
+        store = SqlTokenStore(ttl=60, purge_interval=0)
+        asyncio.run(store.put("stale", 3, time.time() - 120))
+        assert asyncio.run(store.get("stale"))["expires_at"] < time.time()
+
+        asyncio.run(store.put("fresh", 4, time.time()))
+        assert len(asyncio.run(_token_rows())) == 1
+
+    def test_tokens_are_stored_hashed(self, test_db):
+        """Test that raw token values never reach the database."""
+        store = SqlTokenStore(ttl=60)
+        asyncio.run(store.put("raw-token-value", 1, time.time()))
+
+        (row,) = asyncio.run(_token_rows())
+        assert row.token_hash != "raw-token-value"
+        assert len(row.token_hash) == 64
+
+
+class TestJwtTokenIssuer:
+    """Test stateless signed tokens."""
+
+    def _store(self, ttl=60):
+        return JwtTokenIssuer(ttl, SECRET, revoked=MemoryTokenStore(ttl))
+
+    def test_issued_token_carries_claims(self):
+        """Test that issued tokens are HS256 JWTs with sub/exp/jti."""
+        store = self._store()
+        token = asyncio.run(store.issue(42))
+
+        claims = decode_jwt(token, SECRET)
+        assert claims["sub"] == "42"
+        assert claims["exp"] - claims["iat"] == 60
+        assert claims["jti"]
+        assert asyncio.run(store.get(token))["user_id"] == 42
+
+    def test_tampered_token_is_rejected(self):
+        """Test that a token with a modified payload fails verification."""
+        store = self._store()
+        header, _, signature = asyncio.run(store.issue(1)).split(".")
+        forged = encode_jwt(
+            {"sub": "2", "iat": 0, "exp": time.time() + 60, "jti": "x"}, b"other"
+        )
+        payload = forged.split(".")[1]
+
+        assert asyncio.run(store.get(f"{header}.{payload}.{signature}")) is None
+        assert asyncio.run(store.get(forged)) is None
+        assert asyncio.run(store.get("not.a.jwt")) is None
+
+    def test_expired_token_is_reported(self):
+        """Test that tokens past exp resolve with their expiry in the past."""
+        store = self._store()
+        now = int(time.time())
+        token = encode_jwt(
+            {"sub": "1", "iat": now - 120, "exp": now - 60, "jti": "old"}, SECRET
+        )
+
+        assert asyncio.run(store.get(token))["expires_at"] == now - 60
+
+    def test_revoked_token_is_rejected(self):
+        """Test that deleting a token revokes its jti."""
+        store = self._store()
+        token = asyncio.run(store.issue(1))
+        other = asyncio.run(store.issue(1))
+        asyncio.run(store.revoke(token))
+
+        assert asyncio.run(store.get(token)) is None
+        assert asyncio.run(store.get(other)) is not None
+
+    def test_jwt_login_flow(self, client, auth_headers, monkeypatch):
+        """Test login, authenticated request and logout with JWT tokens."""
+        monkeypatch.setattr(main, "_TOKENS", self._store())
+        headers = auth_headers()
+        assert headers["Authorization"].count(".") == 2
+
+        response = client.get("/auth/token-info", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["user_id"] == 1
+
+        assert client.post("/auth/logout", headers=headers).status_code == 200
+        assert client.get("/auth/token-info", headers=headers).status_code == 401
+
+    def test_jwt_requires_secret(self, monkeypatch):
+        """Test that JWT mode refuses to start without a shared JWT_SECRET."""
+        monkeypatch.setattr("app.tokens.TOKEN_FORMAT", "jwt")
+        monkeypatch.setattr("app.tokens.JWT_SECRET", "")
+
+        with pytest.raises(RuntimeError, match="JWT_SECRET"):
+            create_token_issuer(60)
+
+        monkeypatch.setattr("app.tokens.JWT_SECRET", "shared")
+        assert isinstance(create_token_issuer(60), JwtTokenIssuer)
+
+
+def test_logout_invalidates_token(client, auth_headers):
+    """Test that a token cannot be used after logout."""
+    headers = auth_headers()
+
+    assert client.get("/auth/token-info", headers=headers).status_code == 200
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+
+    response = client.get("/auth/token-info", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["error"]["code"] == "invalid_token"
+
+
+def test_expired_token(client):
+    """Test that a token past its TTL is rejected as token_expired."""
+    issued = time.time() - 2 * main.TOKEN_TTL
+    asyncio.run(main._TOKENS.store.put("stale-token", 1, issued))
+
+    response = client.get(
+        "/auth/token-info", headers={"Authorization": "Bearer stale-token"}
+    )
+
+    assert response.status_code == 401
+    assert response.json()["error"]["code"] == "token_expired"
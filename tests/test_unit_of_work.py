@@ -0,0 +1,109 @@
+"""
+Tests for the per-request unit of work.
+
+Tests cover:
+- Multi-step endpoints use a single pooled connection
+- Requests served from the cache take no connection
+- Helpers without a unit of work commit on their own
+- Work is rolled back when the block raises, and committed together otherwise
+- Cache invalidation waits for the commit
+"""
+
+import asyncio
+
+import pytest
+
+from app.cache import suggestion_cache
+from app.database import (
+    create_suggestion_db,
+    get_suggestion_by_id_db,
+    get_suggestions_db,
+    unit_of_work,
+    update_suggestion_db,
+)
+
+
+def _checkouts(response) -> int:
+    fields = dict(
+        part.split("=") for part in response.headers["X-DB-Profile"].split("; ")
+    )
+    return int(fields["checkouts"])
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    suggestion_cache.clear()
+
+
+class TestRequestConnections:
+    def test_register_uses_one_connection(self, client, profile_header):
+        """Test that registering takes one connection, duplicates included."""
+        params = {"username": "newcomer", "password": "pass12345"}
+
+        assert _checkouts(client.post("/auth/register", params=params)) == 1
+        duplicate = client.post("/auth/register", params=params)
+        assert duplicate.status_code == 409
+        assert _checkouts(duplicate) == 1
+
+    def test_update_uses_one_connection(
+        self, client, auth_headers, profile_header, create_suggestion
+    ):
+        """Test that an update and its follow-up queries share one connection."""
+        headers = auth_headers()
+        created = create_suggestion(headers)
+
+        response = client.put(
+            f"/suggestions/{created['id']}",
+            headers=headers,
+            json={"title": "T2", "text": "X"},
+        )
+
+        assert response.status_code == 200
+        assert _checkouts(response) == 1
+
+    def test_cache_hit_takes_no_connection(
+        self, client, auth_headers, profile_header, create_suggestion
+    ):
+        """Test that the connection is only checked out when a query runs."""
+        headers = auth_headers()
+        created = create_suggestion(headers)
+        client.get(f"/suggestions/{created['id']}")
+
+        response = client.get(f"/suggestions/{created['id']}")
+
+        assert response.status_code == 200
+        assert _checkouts(response) == 0
+
+
+class TestUnitOfWork:
+    def test_helpers_commit_on_their_own(self, test_db):
+        """Test that a helper called without a unit of work commits."""
+        row = asyncio.run(create_suggestion_db(1, "Title", "Text"))
+
+        assert asyncio.run(get_suggestion_by_id_db(row["id"]))["title"] == "Title"
+
+    def test_rolled_back_on_error(self, test_db):
+        """Test that nothing done in a failed unit of work is kept."""
+
+        async def scenario():
+            async with unit_of_work() as db:
+                await create_suggestion_db(1, "Title", "Text", db=db)
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(scenario())
+        assert asyncio.run(get_suggestions_db()) == []
+
+    def test_invalidates_cache_after_commit(self, test_db):
+        """Test that cached rows are dropped only once the update is committed."""
+        row = asyncio.run(create_suggestion_db(1, "Before", "Text"))
+        asyncio.run(get_suggestion_by_id_db(row["id"]))
+
+        async def scenario():
+            async with unit_of_work() as db:
+                await update_suggestion_db(row["id"], 1, "After", "Text", db=db)
+                cached = await get_suggestion_by_id_db(row["id"])
+            return cached
+
+        assert asyncio.run(scenario())["title"] == "Before"
+        assert asyncio.run(get_suggestion_by_id_db(row["id"]))["title"] == "After"
@@ -0,0 +1,133 @@
+"""
+Tests for group commit of suggestion creation.
+
+Tests cover:
+- Concurrent creates share one multi-row insert and get their own rows back
+- Batches are flushed early when full
+- A full queue rejects creates; a failed flush fails its whole batch
+- POST /suggestions through the writer, including 503 with backpressure
+"""
+
+import asyncio
+
+import pytest
+
+from app import main, writebehind
+from app.writebehind import SuggestionWriter, WriteQueueFullError
+
+
+@pytest.fixture
+def flushes(monkeypatch):
+    sizes = []
+    original = writebehind.create_suggestions_db
+
+    async def counting(items):
+        sizes.append(len(items))
+        return await original(items)
+
+    monkeypatch.setattr(writebehind, "create_suggestions_db", counting)
+    return sizes
+
+
+def _create_many(writer, count, user_id=1):
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                writer.create(user_id, f"Title {i}", "Text", "new")
+                for i in range(count)
+            ),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(scenario())
+
+
+class TestSuggestionWriter:
+    def test_concurrent_creates_share_a_batch(self, test_db, flushes):
+        """Test that creates arriving together are written by one insert."""
+        writer = SuggestionWriter(max_batch=100, max_delay=0.05, queue_size=100)
+
+        rows = _create_many(writer, 10)
+
+        assert flushes == [10]
+        assert [row["title"] for row in rows] == [f"Title {i}" for i in range(10)]
+        assert [row["id"] for row in rows] == sorted({row["id"] for row in rows})
+        assert writer.queued == 0
+
+    def test_full_batches_flush_early(self, test_db, flushes):
+        """Test that a batch reaching max_batch is written without waiting."""
+        writer = SuggestionWriter(max_batch=3, max_delay=10, queue_size=100)
+
+        async def scenario():
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    *(writer.create(1, f"T{i}", "Text", "new") for i in range(6))
+                ),
+                timeout=5,
+            )
+
+        rows = asyncio.run(scenario())
+
+        assert flushes == [3, 3]
+        assert len({row["id"] for row in rows}) == 6
+
+    def test_queue_full_rejects(self, test_db):
+        """Test that creates beyond queue_size are rejected immediately."""
+        writer = SuggestionWriter(max_batch=100, max_delay=0.01, queue_size=2)
+
+        results = _create_many(writer, 3)
+
+        assert [isinstance(r, WriteQueueFullError) for r in results] == [
+            False,
+            False,
+            True,
+        ]
+        assert writer.queued == 0
+
+    def test_failed_flush_fails_the_batch(self, test_db, monkeypatch):
+        """Test that every waiting create sees the error of its batch."""
+
+        async def failing(items):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(writebehind, "create_suggestions_db", failing)
+        writer = SuggestionWriter(max_batch=100, max_delay=0.01, queue_size=100)
+
+        results = _create_many(writer, 3)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert writer.queued == 0
+
+
+class TestWriteBehindEndpoint:
+    def test_post_through_writer(self, client, auth_headers, monkeypatch, flushes):
+        """Test that POST /suggestions returns the committed row and lists see it."""
+        monkeypatch.setattr(main, "WRITE_BEHIND", True)
+        headers = auth_headers()
+
+        response = client.post(
+            "/suggestions",
+            headers=headers,
+            json={"title": "Grouped", "text": "Text", "status": "reviewing"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Grouped"
+        assert flushes == [1]
+        listed = client.get("/suggestions", params={"status": "reviewing"}).json()
+        assert [s["id"] for s in listed] == [response.json()["id"]]
+
+    def test_full_queue_returns_503(self, client, auth_headers, monkeypatch):
+        """Test that a full write queue asks clients to retry later."""
+        monkeypatch.setattr(main, "WRITE_BEHIND", True)
+        monkeypatch.setattr(writebehind.suggestion_writer, "queue_size", 0)
+
+        response = client.post(
+            "/suggestions",
+            headers=auth_headers(),
+            json={"title": "Dropped", "text": "Text"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["error"]["code"] == "service_unavailable"